@@ -1,16 +1,27 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.core.supabase_client import get_supabase_client
+from app.core.auth_gateway import auth_gateway, AuthRejected, AuthGatewayUnavailable
+from app.db import crud
 from app.db.session import get_db
 from app.db.models import User
 from app.schemas.auth import Login
 from app.schemas.user import UserCreate, UserResponse
 from app.core.dependencies import get_current_user_supabase
-from gotrue.errors import AuthApiError
+from app.core.user_cache import user_cache
 
 router = APIRouter()
 
+optional_bearer = HTTPBearer(auto_error=False)
+
+def _provider_unavailable(e: AuthGatewayUnavailable) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service unavailable, try again shortly",
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
 @router.post("/register", response_model=dict)
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user using Supabase Auth"""
@@ -27,20 +38,19 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
             )
 
         # Create user profile in our database
-        result = await db.execute(select(User).where(User.email == user_in.email))
-        existing_user = result.scalars().first()
+        existing_user = await crud.user.get_by_email(db, user_in.email)
         
         if not existing_user:
-            db_user = User(
-                id=user_in.id,  # Use ID provided by frontend (from Supabase)
-                email=user_in.email,
-                full_name=user_in.full_name,
-                phone=user_in.phone,
-                city_tier=user_in.city_tier
-            )
-            db.add(db_user)
-            await db.commit()
-            await db.refresh(db_user)
+            await crud.user.create(db, {
+                "id": user_in.id,  # Use ID provided by frontend (from Supabase)
+                "email": user_in.email,
+                "full_name": user_in.full_name,
+                "phone": user_in.phone,
+                "city_tier": user_in.city_tier
+            })
+
+        # Drop any snapshot resolved before the profile existed
+        user_cache.invalidate(user_in.id)
         
         return {
             "id": str(user_in.id),
@@ -56,35 +66,32 @@ async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
 @router.post("/login", response_model=dict)
 async def login(login_data: Login):
     """Login using Supabase Auth"""
-    supabase = get_supabase_client()
-    
     try:
-        auth_response = supabase.auth.sign_in_with_password({
-            "email": login_data.email,
-            "password": login_data.password
-        })
-        
-        if not auth_response.session:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid credentials"
-            )
-        
-        return {
-            "access_token": auth_response.session.access_token,
-            "refresh_token": auth_response.session.refresh_token,
-            "token_type": "bearer",
-            "user": {
-                "id": str(auth_response.user.id),
-                "email": auth_response.user.email
-            }
-        }
-        
-    except AuthApiError as e:
+        session = await auth_gateway.sign_in_with_password(login_data.email, login_data.password)
+    except AuthRejected:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
         )
+    except AuthGatewayUnavailable as e:
+        raise _provider_unavailable(e)
+
+    if not session.get("access_token"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid credentials"
+        )
+
+    user = session.get("user") or {}
+    return {
+        "access_token": session["access_token"],
+        "refresh_token": session.get("refresh_token"),
+        "token_type": "bearer",
+        "user": {
+            "id": str(user.get("id")),
+            "email": user.get("email")
+        }
+    }
 
 @router.get("/verify", response_model=UserResponse)
 async def verify(current_user: User = Depends(get_current_user_supabase)):
@@ -92,14 +99,14 @@ async def verify(current_user: User = Depends(get_current_user_supabase)):
     return current_user
 
 @router.post("/logout")
-async def logout():
-    """Logout user from Supabase"""
-    supabase = get_supabase_client()
-    try:
-        supabase.auth.sign_out()
-        return {"message": "Logged out successfully"}
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
+async def logout(credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_bearer)):
+    """Revoke the caller's Supabase session"""
+    if credentials is not None:
+        try:
+            await auth_gateway.sign_out(credentials.credentials)
+        except AuthRejected:
+            # Token already expired or revoked, nothing left to sign out
+            pass
+        except AuthGatewayUnavailable as e:
+            raise _provider_unavailable(e)
+    return {"message": "Logged out successfully"}
@@ -1,23 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import List
+from sqlalchemy.exc import SQLAlchemyError
+from pydantic import ValidationError
+from typing import AsyncIterator, List, Optional, Tuple
+from app.db import crud
 from app.db.session import get_db
 from app.db.models import LoanApplication, User
-from app.schemas.loan import LoanApplicationCreate, LoanApplicationResponse
+from app.schemas.loan import (
+    LoanApplicationCreate,
+    LoanApplicationResponse,
+    LoanBulkApplyResponse,
+    LoanScoreBatchRequest,
+    LoanScoreBatchResponse,
+)
+from app.core.config import settings
 from app.core.dependencies import get_current_user
-from app.ml.credit_model import credit_model
+from app.core.executor import executor, ExecutorSaturated
+from app.core.metrics import ml_scoring_seconds, ml_scored_applications
+from app.core.response_cache import response_cache
+from app.core.responses import prevalidated
+from app.utils.pagination import keyset_page, next_cursor, InvalidCursorError
 
 router = APIRouter()
 
-@router.post("/apply", response_model=LoanApplicationResponse)
-async def apply_for_loan(
-    application: LoanApplicationCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    # Calculate ML Score
-    input_data = [
+# NumPy and the scoring model are imported on first use to keep startup fast
+
+def _features(application: LoanApplicationCreate) -> list:
+    return [
         application.monthly_income * 12,
         application.total_assets,
         application.total_debt_amount,
@@ -25,49 +35,268 @@ async def apply_for_loan(
         application.monthly_emis,
         application.amount_requested
     ]
-    
-    score = credit_model.predict(input_data)
-    
-    # Simple logic for status and acceptance based on score
-    # Score is 0-1
+
+def _decide(score: float) -> Tuple[str, float]:
+    """Map a 0-1 ML score to (status, acceptance percentage)"""
     status_str = "pending"
     acceptance = score * 100 # percentage
-    
+
     if score > 0.7:
         status_str = "approved"
     elif score < 0.3:
         status_str = "rejected"
+
+    return status_str, acceptance
+
+@router.post("/apply", response_model=LoanApplicationResponse)
+async def apply_for_loan(
+    application: LoanApplicationCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    from app.ml.credit_model import credit_model
+
+    # Calculate ML Score
+    with ml_scoring_seconds.time(kind="single"):
+        score = credit_model.predict(_features(application))
+    ml_scored_applications.inc()
+    
+    # Simple logic for status and acceptance based on score
+    # Score is 0-1
+    status_str, acceptance = _decide(score)
         
-    db_loan = LoanApplication(
-        user_id=current_user.id,
-        amount_requested=application.amount_requested,
-        num_debts=application.num_debts,
-        total_debt_amount=application.total_debt_amount,
-        monthly_emis=application.monthly_emis,
-        total_assets=application.total_assets,
-        monthly_income=application.monthly_income,
-        ml_score=score,
-        acceptance_rate=acceptance,
-        status=status_str,
-        feedback={"note": "Automated scoring applied"}
+    loan = await crud.loan.create(db, {
+        "user_id": current_user.id,
+        "amount_requested": application.amount_requested,
+        "num_debts": application.num_debts,
+        "total_debt_amount": application.total_debt_amount,
+        "monthly_emis": application.monthly_emis,
+        "total_assets": application.total_assets,
+        "monthly_income": application.monthly_income,
+        "ml_score": score,
+        "acceptance_rate": acceptance,
+        "status": status_str,
+        "feedback": {"note": "Automated scoring applied"}
+    })
+    await response_cache.invalidate_user(current_user.id)
+    return loan
+
+async def _score(applications: List[LoanApplicationCreate], owner=None) -> List[float]:
+    """Score applications in one vectorized call, large batches go to the CPU pool"""
+    import numpy as np
+    from app.ml.credit_model import credit_model
+
+    features = np.array([_features(application) for application in applications], dtype=float)
+    ml_scored_applications.inc(len(features))
+    if len(features) <= settings.EXECUTOR_INLINE_MAX_ROWS:
+        with ml_scoring_seconds.time(kind="batch"):
+            return credit_model.predict_batch(features).tolist()
+    # Includes the pool round-trip
+    with ml_scoring_seconds.time(kind="batch_pool"):
+        scores = await executor.run_cpu(credit_model.predict_batch, features, owner=owner)
+    return scores.tolist()
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+# Stands in for an NDJSON line longer than LOAN_BULK_MAX_LINE_BYTES
+OVERSIZED_LINE = object()
+
+async def _iter_bulk_rows(request: Request) -> AsyncIterator:
+    """Yield raw applications from a JSON array body or an NDJSON stream"""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        # Read line by line so large broker batches never sit in memory at once
+        limit = settings.LOAN_BULK_MAX_LINE_BYTES
+        buffer = b""
+        skipping = False
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if skipping:
+                    # Tail of an oversized line
+                    skipping = False
+                elif len(line) > limit:
+                    yield OVERSIZED_LINE
+                elif line.strip():
+                    yield line
+            if len(buffer) > limit and not skipping:
+                # No newline in sight, drop the rest of this line as it arrives
+                yield OVERSIZED_LINE
+                skipping = True
+            if skipping:
+                buffer = b""
+        if buffer.strip() and not skipping:
+            yield buffer
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    if isinstance(body, dict):
+        body = body.get("applications")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+
+    for item in body:
+        yield item
+
+def _parse_application(raw) -> LoanApplicationCreate:
+    if raw is OVERSIZED_LINE:
+        raise ValueError(f"row: line exceeds {settings.LOAN_BULK_MAX_LINE_BYTES} bytes")
+    if isinstance(raw, bytes):
+        return LoanApplicationCreate.model_validate_json(raw)
+    return LoanApplicationCreate.model_validate(raw)
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+        for err in error.errors()
     )
-    
-    db.add(db_loan)
-    await db.commit()
-    await db.refresh(db_loan)
-    return db_loan
+
+async def _persist_chunk(db: AsyncSession, user_id, pending: List[Tuple[int, LoanApplicationCreate]]) -> List[dict]:
+    """
+    Score a chunk with one vectorized call and store it with one multi-row
+    INSERT ... RETURNING. A chunk that cannot be scored or stored comes back
+    as failed rows; chunks before it stay committed.
+    """
+    try:
+        scores = await _score([application for _, application in pending], owner=user_id)
+    except ExecutorSaturated as e:
+        return [{"index": index, "status": "failed", "error": e.detail} for index, _ in pending]
+
+    rows = []
+    for (_, application), score in zip(pending, scores):
+        status_str, acceptance = _decide(score)
+        rows.append({
+            **application.model_dump(),
+            "user_id": user_id,
+            "ml_score": score,
+            "acceptance_rate": acceptance,
+            "status": status_str,
+            "feedback": {"note": "Automated scoring applied"},
+        })
+
+    try:
+        loans = await crud.loan.create_many(db, rows)
+        # Validated once here, the response is rendered without another pass
+        loans = [LoanApplicationResponse.model_validate(loan).model_dump() for loan in loans]
+    except SQLAlchemyError as e:
+        await db.rollback()
+        return [{"index": index, "status": "failed", "error": str(e.__cause__ or e)} for index, _ in pending]
+
+    return [
+        {"index": index, "status": "created", "loan": loan}
+        for (index, _), loan in zip(pending, loans)
+    ]
+
+@router.post("/apply/bulk", response_model=LoanBulkApplyResponse)
+async def apply_for_loans_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Submit many applications at once, as a JSON array (or {"applications": [...]})
+    or as an NDJSON stream (Content-Type: application/x-ndjson).
+
+    Rows are validated individually, scored per chunk and inserted with one
+    statement per chunk. Each chunk is committed on its own, so the request
+    can succeed partially: every row gets its own status in the response and
+    only rows marked "created" were stored (e.g. resubmit the "failed" ones
+    when the scoring pool was saturated).
+    """
+    results = []
+    pending: List[Tuple[int, LoanApplicationCreate]] = []
+    truncated = False
+    index = 0
+
+    async for raw in _iter_bulk_rows(request):
+        if index >= settings.LOAN_BULK_MAX_ROWS:
+            truncated = True
+            break
+
+        try:
+            pending.append((index, _parse_application(raw)))
+        except ValidationError as e:
+            results.append({"index": index, "status": "invalid", "error": _validation_message(e)})
+        except ValueError as e:
+            results.append({"index": index, "status": "invalid", "error": str(e)})
+        index += 1
+
+        if len(pending) >= settings.LOAN_BULK_CHUNK_SIZE:
+            results.extend(await _persist_chunk(db, current_user.id, pending))
+            pending = []
+
+    if pending:
+        results.extend(await _persist_chunk(db, current_user.id, pending))
+
+    await response_cache.invalidate_user(current_user.id)
+
+    results.sort(key=lambda row: row["index"])
+    created = sum(1 for row in results if row["status"] == "created")
+    # Loans were validated per chunk, skip a second pass over every row
+    return prevalidated({
+        "created": created,
+        "failed": len(results) - created,
+        "truncated": truncated,
+        "results": [
+            {"index": row["index"], "status": row["status"], "loan": row.get("loan"), "error": row.get("error")}
+            for row in results
+        ]
+    })
+
+@router.post("/score-batch", response_model=LoanScoreBatchResponse)
+async def score_batch(
+    batch: LoanScoreBatchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk pre-qualification: score many applicants in one vectorized pass.
+    At most SCORE_BATCH_MAX_SIZE applications, enforced by the schema (422).
+    """
+    if not batch.applications:
+        return {"scores": []}
+
+    scores = await _score(batch.applications, owner=current_user.id)
+
+    results = []
+    for score in scores:
+        status_str, acceptance = _decide(score)
+        results.append({"ml_score": score, "acceptance_rate": acceptance, "status": status_str})
+
+    return prevalidated({"scores": results})
 
 @router.get("/user/{id}", response_model=List[LoanApplicationResponse])
 async def get_user_loans(
     id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
+    """
+    Newest applications first, `limit` (PAGE_SIZE_DEFAULT) per page; pass
+    X-Next-Cursor back as ?cursor= for the next page until it is absent
+    """
     if str(current_user.id) != id:
         raise HTTPException(status_code=403, detail="Not authorized")
-        
-    result = await db.execute(select(LoanApplication).where(LoanApplication.user_id == id))
-    return result.scalars().all()
+
+    query = select(LoanApplication).where(LoanApplication.user_id == current_user.id)
+    try:
+        query = keyset_page(query, LoanApplication, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = await db.execute(query)
+    loans, cursor_out = next_cursor(result.scalars().all(), limit)
+    if cursor_out:
+        response.headers["X-Next-Cursor"] = cursor_out
+    return loans
 
 @router.get("/{loan_id}", response_model=LoanApplicationResponse)
 async def get_loan(
@@ -75,8 +304,7 @@ async def get_loan(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(LoanApplication).where(LoanApplication.id == loan_id))
-    loan = result.scalars().first()
+    loan = await crud.loan.get(db, loan_id)
     if not loan:
         raise HTTPException(status_code=404, detail="Loan not found")
         
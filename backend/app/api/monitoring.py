@@ -0,0 +1,98 @@
+import asyncio
+import time
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import text
+from app.core.auth_gateway import auth_gateway
+from app.core.config import settings
+from app.core.executor import executor
+from app.core.metrics import metrics
+from app.core.response_cache import response_cache
+from app.core.user_cache import user_cache
+from app.db.session import engine, get_pool_stats
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+db_pool_connections = metrics.gauge("db_pool_connections", "Pooled database connections by state", ["state"])
+db_pool_checkouts = metrics.counter("db_pool_checkouts_total", "Connections handed out by the pool")
+db_pool_timeouts = metrics.counter("db_pool_timeouts_total", "Checkouts that timed out waiting for a connection")
+db_pool_wait_seconds = metrics.counter("db_pool_wait_seconds_total", "Time spent waiting for a pooled connection")
+executor_pending = metrics.gauge("executor_pending_tasks", "Queued or running tasks per pool", ["pool"])
+executor_rejected = metrics.counter("executor_rejected_total", "Tasks refused because a pool or user was saturated", ["pool"])
+executor_task_seconds = metrics.counter("executor_task_seconds_total", "Time spent in executor tasks", ["task"])
+executor_tasks = metrics.counter("executor_tasks_total", "Executor tasks run", ["task"])
+cache_requests = metrics.counter("cache_requests_total", "Cache lookups by result", ["cache", "result"])
+auth_circuit_open = metrics.gauge("auth_gateway_circuit_open", "1 while the Supabase Auth circuit breaker is open or half-open")
+
+
+@metrics.on_collect
+def _collect_runtime():
+    pool = get_pool_stats()
+    for state in ("checked_out", "checked_in", "overflow"):
+        if state in pool:
+            db_pool_connections.set(pool[state], state=state)
+    if "checkouts" in pool:
+        db_pool_checkouts.set(pool["checkouts"])
+        db_pool_timeouts.set(pool["timeouts"])
+        db_pool_wait_seconds.set(pool["wait_seconds_total"])
+
+    stats = executor.stats()
+    for kind in ("io", "cpu"):
+        executor_pending.set(stats["pending"].get(kind, 0), pool=kind)
+        executor_rejected.set(stats["rejected"].get(kind, 0), pool=kind)
+    for task, values in stats["tasks"].items():
+        executor_task_seconds.set(values["total_seconds"], task=task)
+        executor_tasks.set(values["count"], task=task)
+
+    for name, cache in (("response", response_cache), ("user", user_cache)):
+        cache_requests.set(cache.hits, cache=name, result="hit")
+        cache_requests.set(cache.misses, cache=name, result="miss")
+
+    auth_circuit_open.set(0 if auth_gateway.breaker.state == "closed" else 1)
+
+
+async def _check_database() -> dict:
+    start = time.perf_counter()
+    try:
+        async with engine.connect() as conn:
+            await asyncio.wait_for(conn.execute(text("SELECT 1")), settings.HEALTH_DB_TIMEOUT_SECONDS)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}", "pool": get_pool_stats()}
+    return {"ok": True, "latency_ms": round((time.perf_counter() - start) * 1000, 2), "pool": get_pool_stats()}
+
+
+@router.get("/health")
+async def health_check():
+    """
+    Readiness: 503 when the database is unreachable. An open auth circuit
+    only reports "degraded", since routes without auth keep working.
+    """
+    database = await _check_database()
+    auth = auth_gateway.status()
+
+    if not database["ok"]:
+        status = "unavailable"
+    elif auth["circuit"] != "closed":
+        status = "degraded"
+    else:
+        status = "ok"
+
+    return JSONResponse(
+        status_code=503 if status == "unavailable" else 200,
+        content={"status": status, "database": database, "auth": auth},
+    )
+
+
+@router.get("/health/live")
+async def liveness_check():
+    """The process is up and serving; no dependencies are checked"""
+    return {"status": "ok"}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
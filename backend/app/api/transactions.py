@@ -1,72 +1,155 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, File, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import load_only
+from typing import List, Optional, Tuple
+from uuid import UUID
+from app.db import crud
 from app.db.session import get_db
-from app.db.models import Transaction, FinancialBehavior, User
-from app.schemas.transaction import TransactionResponse, FinancialBehaviorResponse
+from app.db.models import Transaction, User
+from app.schemas.transaction import TransactionResponse, TransactionSummaryResponse, UploadJobResponse
+from app.core.config import settings
 from app.core.dependencies import get_current_user
-from app.utils.file_parser import parse_transaction_file
-from app.ml.behavior_scoring import analyze_behavior
-import json
+from app.core.executor import executor
+from app.core.metrics import upload_size_bytes
+from app.core.response_cache import response_cache
+from app.core.responses import prevalidated
+from app.utils.file_parser import is_supported_file, read_upload, FileTooLargeError
+from app.services.uploads import save_statement
+from app.services.upload_jobs import enqueue_upload
+from app.utils.pagination import keyset_page, next_cursor, InvalidCursorError
 
 router = APIRouter()
 
+async def _read_upload(file: UploadFile, owner) -> Tuple[bytes, str]:
+    if not is_supported_file(file.filename):
+        raise HTTPException(status_code=400, detail="Invalid file format")
+    try:
+        content, content_hash = await executor.run_io(read_upload, file.file, settings.MAX_UPLOAD_MB, owner=owner)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    upload_size_bytes.observe(len(content))
+    return content, content_hash
+
+def _transaction_response(transaction: Transaction):
+    # The analysis can be large, hand it to the encoder as-is
+    return prevalidated({
+        "id": transaction.id,
+        "user_id": transaction.user_id,
+        "file_name": transaction.file_name,
+        "analysis_result": transaction.analysis_result,
+    })
+
 @router.post("/upload", response_model=TransactionResponse)
 async def upload_transactions(
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    # 1. Parse File
-    df = await parse_transaction_file(file)
-    
-    # 2. Convert to JSON for storage
-    records = df.to_dict(orient='records')
-    
-    # 3. Analyze
-    analysis = analyze_behavior(df)
-    
-    # 4. Save Transaction Record
-    db_transaction = Transaction(
-        user_id=current_user.id,
-        file_name=file.filename,
-        transaction_data=records, # Storing raw data might be heavy, but requested
-        analysis_result=analysis
+    # 1. Read upload (thread pool) within the size limit, hashing it on the way
+    content, content_hash = await _read_upload(file, current_user.id)
+
+    # Same file uploaded before: return the stored analysis, nothing is parsed or written
+    existing = await crud.transaction.get_by_content_hash(db, current_user.id, content_hash)
+    if existing:
+        return _transaction_response(existing)
+
+    # Loaded on first upload, keeps pandas out of app startup
+    from app.services.statements import process_statement
+
+    try:
+        # 2. Parse into statement lines and 3. Analyze (process pool)
+        lines, analysis, summary = await executor.run_cpu(process_statement, file.filename, content, owner=current_user.id)
+    except ValueError as e:
+        # Parser and format errors only; ExecutorSaturated maps to 503/429 in the app
+        raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
+
+    # 4./5. Save transaction record and behaviour summary
+    db_transaction = await save_statement(db, current_user.id, file.filename, lines, analysis, summary, content_hash)
+    return _transaction_response(db_transaction)
+
+@router.post("/upload/async", response_model=UploadJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_transactions_async(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Queue a statement for background processing, poll /jobs/{id} for the
+    result. Re-uploading a file returns its existing job.
+    """
+    content, content_hash = await _read_upload(file, current_user.id)
+    return await enqueue_upload(db, current_user.id, file.filename, content, content_hash)
+
+@router.get("/jobs/{job_id}", response_model=UploadJobResponse)
+async def get_upload_job(
+    job_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    job = await crud.upload_job.get(db, job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if str(job.user_id) != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return job
+
+@router.get("/user/{id}", response_model=List[TransactionSummaryResponse])
+async def get_user_transactions(
+    id: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List a user's uploads (newest first) without loading line data or analysis"""
+    if str(current_user.id) != id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    query = (
+        select(Transaction)
+        .options(load_only(
+            Transaction.id, Transaction.file_name, Transaction.row_count,
+            Transaction.period_start, Transaction.period_end,
+            Transaction.total_income, Transaction.total_expense, Transaction.created_at,
+        ))
+        .where(Transaction.user_id == current_user.id)
     )
-    db.add(db_transaction)
-    
-    # 5. Update/Create Financial Behavior
-    # Check if exists
-    result = await db.execute(select(FinancialBehavior).where(FinancialBehavior.user_id == current_user.id))
-    behavior = result.scalars().first()
-    
-    if not behavior:
-        behavior = FinancialBehavior(user_id=current_user.id)
-        db.add(behavior)
-    
-    behavior.total_score = analysis['total_score']
-    behavior.behavior_rating = analysis['behavior_rating']
-    behavior.category_scores = analysis['category_scores']
-    behavior.liquidity_resilience_days = analysis['liquidity_resilience_days']
-    
-    await db.commit()
-    await db.refresh(db_transaction)
-    
-    return db_transaction
+    try:
+        query = keyset_page(query, Transaction, cursor, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    result = await db.execute(query)
+    transactions, cursor_out = next_cursor(result.scalars().all(), limit)
+    if cursor_out:
+        response.headers["X-Next-Cursor"] = cursor_out
+    return transactions
 
 @router.get("/analyze/{id}", response_model=TransactionResponse)
 async def get_analysis(
-    id: str,
+    id: UUID,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(select(Transaction).where(Transaction.id == id))
-    transaction = result.scalars().first()
-    
-    if not transaction:
-        raise HTTPException(status_code=404, detail="Transaction not found")
-        
-    if str(transaction.user_id) != str(current_user.id):
-        raise HTTPException(status_code=403, detail="Not authorized")
-        
-    return transaction
+    async def load():
+        transaction = await crud.transaction.get(db, id)
+
+        if not transaction:
+            raise HTTPException(status_code=404, detail="Transaction not found")
+
+        if str(transaction.user_id) != str(current_user.id):
+            raise HTTPException(status_code=403, detail="Not authorized")
+
+        return transaction
+
+    # Keyed per user, so a cached analysis is only ever served to its owner
+    return await response_cache.respond(
+        request, load, TransactionResponse,
+        ttl=settings.USER_DATA_CACHE_TTL_SECONDS, user_id=current_user.id
+    )
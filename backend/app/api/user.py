@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.core.config import settings
 from app.core.dependencies import get_current_user
+from app.core.response_cache import response_cache
+from app.db import crud
 from app.db.session import get_db
-from app.db.models import User, FinancialBehavior
+from app.db.models import User
 from app.schemas.user import UserResponse
 from app.schemas.transaction import FinancialBehaviorResponse
 
@@ -15,16 +17,21 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.get("/financial-behavior/{id}", response_model=FinancialBehaviorResponse)
-async def get_financial_behavior(id: str, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_financial_behavior(id: str, request: Request, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     # Ensure user can only see their own behavior unless admin (not specified, assuming isolation)
     if str(current_user.id) != id:
         raise HTTPException(status_code=403, detail="Not authorized to view this data")
 
-    result = await db.execute(select(FinancialBehavior).where(FinancialBehavior.user_id == id))
-    behavior = result.scalars().first()
-    
-    if not behavior:
-        # Return empty/default if not found or 404
-        raise HTTPException(status_code=404, detail="Financial behavior not found")
-        
-    return behavior
+    async def load():
+        behavior = await crud.financial_behavior.get_by_user(db, current_user.id)
+
+        if not behavior:
+            # Return empty/default if not found or 404
+            raise HTTPException(status_code=404, detail="Financial behavior not found")
+
+        return behavior
+
+    return await response_cache.respond(
+        request, load, FinancialBehaviorResponse,
+        ttl=settings.USER_DATA_CACHE_TTL_SECONDS, user_id=current_user.id
+    )
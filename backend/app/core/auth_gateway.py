@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AuthRejected(Exception):
+    """Supabase Auth answered and refused the request (bad credentials, invalid token)"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AuthGatewayUnavailable(Exception):
+    """Supabase Auth is unreachable, too slow, or the circuit breaker is open"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls
+    for `reset_seconds`; then lets one trial call through (half-open) and
+    closes again if it succeeds.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_running):
+            remaining = self.reset_seconds - (time.monotonic() - self.opened_at)
+            raise AuthGatewayUnavailable("Auth provider circuit is open", retry_after=max(1, int(remaining)))
+        if state == "half-open":
+            self._trial_running = True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def release_trial(self):
+        """The call ended without a verdict on the provider (e.g. cancelled), let another one be the trial"""
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_running = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("Auth provider circuit opened after %s failures", self.failures)
+            self.opened_at = time.monotonic()
+
+
+class SupabaseAuthGateway:
+    """
+    Async client for the Supabase Auth (GoTrue) REST API.
+
+    One pooled httpx client is shared by all requests. Transient failures
+    (network errors, timeouts, 5xx/429) are retried a bounded number of times
+    with jittered backoff, and feed a circuit breaker so a slow or failing
+    identity provider only degrades the auth routes.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float,
+        connect_timeout: float,
+        retries: int,
+        max_connections: int,
+        breaker: CircuitBreaker,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = f"{base_url.rstrip('/')}/auth/v1"
+        self.api_key = api_key
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.retries = retries
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.breaker = breaker
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # Created on first use so it binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"apikey": self.api_key},
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, path: str, token: Optional[str] = None, **kwargs) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        last_error = ""
+
+        for attempt in range(self.retries + 1):
+            self.breaker.before_call()
+            try:
+                response = await self._http().request(method, path, headers=headers, **kwargs)
+            except httpx.HTTPError as e:
+                last_error = f"{type(e).__name__}: {e}"
+            except BaseException:
+                # Cancelled (client went away) or an unexpected error, not the provider's fault
+                self.breaker.release_trial()
+                raise
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    # A 4xx answer is a healthy provider saying no
+                    self.breaker.record_success()
+                    if response.status_code >= 400:
+                        raise AuthRejected(response.status_code, _error_message(response))
+                    return response
+                last_error = f"HTTP {response.status_code}"
+
+            self.breaker.record_failure()
+            if attempt < self.retries:
+                await asyncio.sleep(min(2.0, 0.1 * 2 ** attempt) * (0.5 + random.random()))
+
+        raise AuthGatewayUnavailable(f"Auth provider request failed: {last_error}")
+
+    async def sign_in_with_password(self, email: str, password: str) -> Dict[str, Any]:
+        response = await self._request(
+            "POST", "/token", params={"grant_type": "password"},
+            json={"email": email, "password": password},
+        )
+        return response.json()
+
+    async def sign_out(self, access_token: str) -> None:
+        await self._request("POST", "/logout", token=access_token)
+
+    async def get_user(self, access_token: str) -> Dict[str, Any]:
+        response = await self._request("GET", "/user", token=access_token)
+        return response.json()
+
+    def status(self) -> Dict[str, Any]:
+        return {"circuit": self.breaker.state, "consecutive_failures": self.breaker.failures}
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        body = response.json()
+    except ValueError:
+        return response.text or f"HTTP {response.status_code}"
+    return body.get("error_description") or body.get("msg") or body.get("message") or str(body)
+
+
+auth_gateway = SupabaseAuthGateway(
+    settings.SUPABASE_URL,
+    settings.SUPABASE_KEY,
+    timeout=settings.AUTH_GATEWAY_TIMEOUT_SECONDS,
+    connect_timeout=settings.AUTH_GATEWAY_CONNECT_TIMEOUT_SECONDS,
+    retries=settings.AUTH_GATEWAY_RETRIES,
+    max_connections=settings.AUTH_GATEWAY_MAX_CONNECTIONS,
+    breaker=CircuitBreaker(settings.AUTH_BREAKER_FAILURES, settings.AUTH_BREAKER_RESET_SECONDS),
+)
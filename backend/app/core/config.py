@@ -1,23 +1,174 @@
 import os
-from typing import List
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+def _env_bool(name: str) -> Optional[bool]:
+    value = os.getenv(name)
+    return value.lower() == "true" if value not in (None, "") else None
+
+# Database engine/pool defaults per APP_ENV; DB_* variables override single values
+DB_PROFILES = {
+    "development": {
+        "echo": False,
+        "pool_size": 5,
+        "max_overflow": 5,
+        "pool_timeout": 30,
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 0,
+    },
+    "production": {
+        "echo": False,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_recycle": 900,
+        "pool_pre_ping": True,
+        "statement_timeout_ms": 30000,
+    },
+    "test": {
+        "echo": False,
+        "pool_size": 2,
+        "max_overflow": 2,
+        "pool_timeout": 5,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+        "statement_timeout_ms": 0,
+    },
+}
+
 class Settings:
     """Application settings loaded from environment variables"""
     
     PROJECT_NAME: str = "FinV2 Backend"
     API_V1_STR: str = "/api"
+    APP_ENV: str = os.getenv("APP_ENV", "development") # development / production / test
     
     # Database - from .env
     DATABASE_URL: str = os.getenv("DATABASE_URL")
+    DB_SSLMODE: str = os.getenv("DB_SSLMODE", "require") # Supabase requires SSL
+    # PgBouncer in transaction-pooling mode can't keep server-side prepared statements
+    DB_PGBOUNCER: bool = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
+    DB_ECHO: Optional[bool] = _env_bool("DB_ECHO")
+    DB_POOL_SIZE: Optional[int] = _env_int("DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: Optional[int] = _env_int("DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: Optional[int] = _env_int("DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: Optional[int] = _env_int("DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: Optional[bool] = _env_bool("DB_POOL_PRE_PING")
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = _env_int("DB_STATEMENT_TIMEOUT_MS")
+
+    def db_engine_options(self) -> dict:
+        """Engine/pool options for APP_ENV with any DB_* overrides applied"""
+        options = dict(DB_PROFILES.get(self.APP_ENV, DB_PROFILES["development"]))
+        overrides = {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "statement_timeout_ms": self.DB_STATEMENT_TIMEOUT_MS,
+        }
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return options
     
     # Supabase - from .env
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+
+    # Auth - token verification
+    # "local" verifies the JWT in-process (project secret or cached JWKS),
+    # "remote" asks Supabase Auth for every request.
+    AUTH_VERIFY_MODE: str = os.getenv("AUTH_VERIFY_MODE", "local")
+    AUTH_REMOTE_FALLBACK: bool = os.getenv("AUTH_REMOTE_FALLBACK", "true").lower() == "true"
+    SUPABASE_JWT_SECRET: str = os.getenv("SUPABASE_JWT_SECRET", "")
+    SUPABASE_JWT_AUDIENCE: str = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+    JWKS_CACHE_TTL_SECONDS: int = int(os.getenv("JWKS_CACHE_TTL_SECONDS", "600"))
+
+    # Auth gateway (login/logout/remote verification against Supabase Auth)
+    AUTH_GATEWAY_TIMEOUT_SECONDS: float = float(os.getenv("AUTH_GATEWAY_TIMEOUT_SECONDS", "5"))
+    AUTH_GATEWAY_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("AUTH_GATEWAY_CONNECT_TIMEOUT_SECONDS", "2"))
+    AUTH_GATEWAY_RETRIES: int = int(os.getenv("AUTH_GATEWAY_RETRIES", "2"))
+    AUTH_GATEWAY_MAX_CONNECTIONS: int = int(os.getenv("AUTH_GATEWAY_MAX_CONNECTIONS", "20"))
+    # Circuit breaker: open after N consecutive failures, retry after the reset period
+    AUTH_BREAKER_FAILURES: int = int(os.getenv("AUTH_BREAKER_FAILURES", "5"))
+    AUTH_BREAKER_RESET_SECONDS: float = float(os.getenv("AUTH_BREAKER_RESET_SECONDS", "30"))
+
+    # Resolved users cached per token subject
+    USER_CACHE_TTL_SECONDS: int = int(os.getenv("USER_CACHE_TTL_SECONDS", "300"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
     
+    # Loans - maximum applicants per batch scoring request
+    SCORE_BATCH_MAX_SIZE: int = int(os.getenv("SCORE_BATCH_MAX_SIZE", "10000"))
+    # Bulk applications - rows per multi-row INSERT and per request
+    LOAN_BULK_CHUNK_SIZE: int = int(os.getenv("LOAN_BULK_CHUNK_SIZE", "500"))
+    LOAN_BULK_MAX_ROWS: int = int(os.getenv("LOAN_BULK_MAX_ROWS", "10000"))
+    # Longest accepted NDJSON line; longer ones are reported invalid without being buffered
+    LOAN_BULK_MAX_LINE_BYTES: int = int(os.getenv("LOAN_BULK_MAX_LINE_BYTES", "65536"))
+
+    # List endpoints - default and maximum page size for cursor pagination
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "50"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "200"))
+
+    # Uploads - statement size limit and rows per parsed batch
+    MAX_UPLOAD_MB: int = int(os.getenv("MAX_UPLOAD_MB", "5"))
+    UPLOAD_CHUNK_ROWS: int = int(os.getenv("UPLOAD_CHUNK_ROWS", "50000"))
+
+    # Background upload jobs (DB-table queue polled by in-process workers)
+    UPLOAD_JOBS_ENABLED: bool = os.getenv("UPLOAD_JOBS_ENABLED", "true").lower() == "true"
+    UPLOAD_JOB_WORKERS: int = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+    UPLOAD_JOB_POLL_SECONDS: float = float(os.getenv("UPLOAD_JOB_POLL_SECONDS", "2"))
+    # A claimed job is leased to its worker, which renews the lease while it runs;
+    # an expired lease means the worker died and the job can be taken over
+    UPLOAD_JOB_LEASE_SECONDS: int = int(os.getenv("UPLOAD_JOB_LEASE_SECONDS", "120"))
+    UPLOAD_JOB_MAX_ATTEMPTS: int = int(os.getenv("UPLOAD_JOB_MAX_ATTEMPTS", "3"))
+
+    # Executors for blocking work: threads for I/O, processes for CPU-bound work
+    # (EXECUTOR_CPU_MODE=thread keeps everything in-process, e.g. for tests)
+    EXECUTOR_IO_WORKERS: int = int(os.getenv("EXECUTOR_IO_WORKERS", "8"))
+    EXECUTOR_CPU_WORKERS: int = int(os.getenv("EXECUTOR_CPU_WORKERS", "0")) # 0 = cpu count
+    EXECUTOR_CPU_MODE: str = os.getenv("EXECUTOR_CPU_MODE", "process")
+    EXECUTOR_MAX_PENDING: int = int(os.getenv("EXECUTOR_MAX_PENDING", "32"))
+    EXECUTOR_MAX_TASKS_PER_USER: int = int(os.getenv("EXECUTOR_MAX_TASKS_PER_USER", "2"))
+    # Batches smaller than this are scored inline, the pool round-trip costs more
+    EXECUTOR_INLINE_MAX_ROWS: int = int(os.getenv("EXECUTOR_INLINE_MAX_ROWS", "1000"))
+
+    # Transaction categorization rules (first matching rule wins)
+    CATEGORY_RULES_PATH: str = os.getenv(
+        "CATEGORY_RULES_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "category_rules.json")
+    )
+
+    # Bank catalogue file, re-read when it changes (checked every N seconds, 0 = never)
+    BANKS_PATH: str = os.getenv(
+        "BANKS_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "banks.json")
+    )
+    BANKS_RELOAD_SECONDS: float = float(os.getenv("BANKS_RELOAD_SECONDS", "5"))
+
+    # Response cache for read-mostly GET endpoints (ETag / 304)
+    # RESPONSE_CACHE_BACKEND="module:ClassName" plugs in a shared store, default is in-process
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    RESPONSE_CACHE_BACKEND: str = os.getenv("RESPONSE_CACHE_BACKEND", "")
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+    BANKS_CACHE_TTL_SECONDS: int = int(os.getenv("BANKS_CACHE_TTL_SECONDS", "300"))
+    USER_DATA_CACHE_TTL_SECONDS: int = int(os.getenv("USER_DATA_CACHE_TTL_SECONDS", "60"))
+
+    # Observability: Prometheus text at /api/metrics, readiness at /api/health
+    # Off by default, metrics reveal per-route traffic; enable where only the scraper can reach it
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+    HEALTH_DB_TIMEOUT_SECONDS: float = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", "2"))
+
+    # App-wide JSON encoder: "orjson" (if installed) or "std"
+    JSON_RESPONSE_CLASS: str = os.getenv("JSON_RESPONSE_CLASS", "orjson")
+
     # CORS - from .env
     CORS_ORIGINS: List[str] = [
         origin.strip() 
@@ -1,11 +1,13 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from app.db import crud
 from app.db.session import get_db
 from app.db.models import User
-from app.core.supabase_client import get_supabase_client
-from gotrue.errors import AuthApiError
+from app.core.auth_gateway import AuthGatewayUnavailable
+from app.core.metrics import auth_verify_seconds
+from app.core.security import token_verifier, TokenVerificationError
+from app.core.user_cache import user_cache
 
 security = HTTPBearer()
 
@@ -16,41 +18,37 @@ async def get_current_user_supabase(
     """
     Verify Supabase JWT token and return current user from database
     """
-    supabase = get_supabase_client()
-    
     try:
-        # Verify token with Supabase
-        user_response = supabase.auth.get_user(credentials.credentials)
-        
-        if not user_response.user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        
+        # Verify token signature and expiry in-process (falls back to Supabase if configured)
+        with auth_verify_seconds.time():
+            token = await token_verifier.verify(credentials.credentials)
+
+        cached_user = user_cache.get(token.sub)
+        if cached_user is not None:
+            return cached_user
+
         # Get user from our database
-        result = await db.execute(
-            select(User).where(User.email == user_response.user.email)
-        )
-        db_user = result.scalars().first()
-        
+        db_user = await crud.user.get_by_email(db, token.email)
+
         if not db_user:
             # Create user if doesn't exist (in case they registered directly in Supabase)
-            db_user = User(
-                id=user_response.user.id,
-                email=user_response.user.email,
-                full_name=user_response.user.user_metadata.get("full_name", ""),
-                phone=user_response.user.user_metadata.get("phone", ""),
-                city_tier=user_response.user.user_metadata.get("city_tier", 1)
-            )
-            db.add(db_user)
-            await db.commit()
-            await db.refresh(db_user)
-        
-        return db_user
-        
-    except AuthApiError as e:
+            db_user = await crud.user.create(db, {
+                "id": token.sub,
+                "email": token.email,
+                "full_name": token.user_metadata.get("full_name", ""),
+                "phone": token.user_metadata.get("phone", ""),
+                "city_tier": token.user_metadata.get("city_tier", 1)
+            })
+
+        return user_cache.set(token.sub, db_user)
+
+    except AuthGatewayUnavailable as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service unavailable, try again shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except TokenVerificationError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
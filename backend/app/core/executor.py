@@ -0,0 +1,137 @@
+import asyncio
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+from app.core.config import settings
+
+
+class ExecutorSaturated(Exception):
+    """Raised instead of queueing work when a pool or a user is over its limit"""
+
+    def __init__(self, detail: str, status_code: int = 503, retry_after: int = 1):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _timed_call(fn: Callable, submitted_at: float, *args, **kwargs):
+    # Runs inside the worker; wall-clock time so it is comparable across processes
+    started_at = time.time()
+    return fn(*args, **kwargs), started_at - submitted_at
+
+
+class TaskExecutor:
+    """
+    Runs blocking work off the event loop.
+
+    `run_io` uses a thread pool (file reads, sync client calls), `run_cpu` a
+    process pool (pandas parsing, analysis, scoring) so heavy uploads don't
+    hold the worker's GIL. Each pool admits at most `max_pending` queued or
+    running tasks and each owner (user) at most `max_per_owner`; beyond that
+    ExecutorSaturated is raised and mapped to 503/429 by the app.
+    """
+
+    def __init__(
+        self,
+        io_workers: int,
+        cpu_workers: int,
+        max_pending: int,
+        max_per_owner: int,
+        cpu_mode: str = "process"
+    ):
+        self.io_workers = io_workers
+        self.cpu_workers = cpu_workers
+        self.max_pending = max_pending
+        self.max_per_owner = max_per_owner
+        self.cpu_mode = cpu_mode
+        self._pools: Dict[str, Executor] = {}
+        self._pending: Dict[str, int] = defaultdict(int)
+        self._owner_pending: Dict[Any, int] = defaultdict(int)
+        self.rejected: Dict[str, int] = defaultdict(int)
+        self.task_stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0, "queue_seconds": 0.0}
+        )
+
+    def _pool(self, kind: str) -> Executor:
+        # Pools are created on first use so importing the app stays cheap
+        if kind not in self._pools:
+            if kind == "cpu" and self.cpu_mode == "process":
+                self._pools[kind] = ProcessPoolExecutor(max_workers=self.cpu_workers)
+            else:
+                workers = self.io_workers if kind == "io" else self.cpu_workers
+                self._pools[kind] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{kind}-pool")
+        return self._pools[kind]
+
+    async def run_io(self, fn: Callable, *args, owner: Optional[Any] = None, **kwargs):
+        return await self._submit("io", fn, args, kwargs, owner)
+
+    async def run_cpu(self, fn: Callable, *args, owner: Optional[Any] = None, **kwargs):
+        return await self._submit("cpu", fn, args, kwargs, owner)
+
+    async def _submit(self, kind: str, fn: Callable, args: tuple, kwargs: dict, owner: Optional[Any]):
+        if self._pending[kind] >= self.max_pending:
+            self.rejected[kind] += 1
+            raise ExecutorSaturated("Server is busy, please retry shortly", status_code=503)
+        if owner is not None and self._owner_pending[owner] >= self.max_per_owner:
+            self.rejected[kind] += 1
+            raise ExecutorSaturated("Too many concurrent requests", status_code=429)
+
+        self._pending[kind] += 1
+        if owner is not None:
+            self._owner_pending[owner] += 1
+
+        name = f"{kind}:{getattr(fn, '__qualname__', repr(fn))}"
+        stats = self.task_stats[name]
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            call = partial(_timed_call, fn, time.time(), *args, **kwargs)
+            pool = self._pool(kind)
+            result, queue_seconds = await loop.run_in_executor(pool, call)
+            stats["queue_seconds"] += queue_seconds
+            return result
+        except BrokenExecutor:
+            # A worker process died (e.g. OOM-killed); start a fresh pool for the next task
+            stats["errors"] += 1
+            if self._pools.get(kind) is pool:
+                del self._pools[kind]
+                pool.shutdown(wait=False)
+            raise ExecutorSaturated("Worker pool restarted, please retry", status_code=503)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stats["count"] += 1
+            stats["total_seconds"] += elapsed
+            stats["max_seconds"] = max(stats["max_seconds"], elapsed)
+            self._pending[kind] -= 1
+            if owner is not None:
+                self._owner_pending[owner] -= 1
+                if not self._owner_pending[owner]:
+                    del self._owner_pending[owner]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": dict(self._pending),
+            "rejected": dict(self.rejected),
+            "tasks": {name: dict(values) for name, values in self.task_stats.items()},
+        }
+
+    def shutdown(self, wait: bool = True):
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
+        self._pools.clear()
+
+
+executor = TaskExecutor(
+    io_workers=settings.EXECUTOR_IO_WORKERS,
+    cpu_workers=settings.EXECUTOR_CPU_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.EXECUTOR_MAX_PENDING,
+    max_per_owner=settings.EXECUTOR_MAX_TASKS_PER_USER,
+    cpu_mode=settings.EXECUTOR_CPU_MODE,
+)
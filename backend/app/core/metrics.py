@@ -0,0 +1,249 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Instruments are module-level objects registered on `metrics`; values that
+live elsewhere (pool, executor, caches) are copied in by collectors that run
+right before each scrape. Per-request DB usage is tracked through a context
+variable set by MetricsMiddleware and fed by SQLAlchemy cursor events.
+"""
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (10_000, 100_000, 500_000, 1_000_000, 2_000_000, 5_000_000, 10_000_000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Exposition lines for every label combination"""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels):
+        """Mirror a total that is counted elsewhere (used by collectors)"""
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[str]:
+        lines = []
+        bounds = self.buckets + (float("inf"),)
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _register(self, metric: _Metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def on_collect(self, collector: Callable[[], None]):
+        """Run `collector` before every render, to copy in values kept elsewhere"""
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_request_seconds = metrics.histogram(
+    "http_request_duration_seconds", "Request latency by route", ["method", "route", "status"]
+)
+http_request_db_queries = metrics.histogram(
+    "http_request_db_queries", "Database queries issued per request", ["route"], buckets=COUNT_BUCKETS
+)
+http_request_db_seconds = metrics.histogram(
+    "http_request_db_seconds", "Time spent in database queries per request", ["route"]
+)
+db_query_seconds = metrics.histogram("db_query_duration_seconds", "Latency of single database queries")
+auth_verify_seconds = metrics.histogram("auth_verify_duration_seconds", "Access token verification time")
+ml_scoring_seconds = metrics.histogram(
+    "ml_scoring_duration_seconds", "Credit model scoring time per call", ["kind"]
+)
+ml_scored_applications = metrics.counter("ml_scored_applications_total", "Applications scored by the credit model")
+upload_size_bytes = metrics.histogram(
+    "upload_size_bytes", "Size of uploaded statements", buckets=SIZE_BUCKETS
+)
+
+
+class RequestStats:
+    """Database usage of the request being handled"""
+
+    __slots__ = ("db_queries", "db_seconds")
+
+    def __init__(self):
+        self.db_queries = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def instrument_engine(engine):
+    """Time every statement run by `engine` (sync or async engine)"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        db_query_seconds.observe(elapsed)
+        # The async engine runs this in a greenlet that shares the request's context
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.db_queries += 1
+            stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency and DB usage per route template
+    (e.g. /api/loans/{loan_id}), so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+            # Set by the router once a route matched
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            http_request_seconds.observe(elapsed, method=scope["method"], route=path, status=status_code)
+            http_request_db_queries.observe(stats.db_queries, route=path)
+            http_request_db_seconds.observe(stats.db_seconds, route=path)
@@ -0,0 +1,177 @@
+import hashlib
+import importlib
+import inspect
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from app.core.config import settings
+
+# (etag, serialized JSON body)
+CacheEntry = Tuple[str, bytes]
+
+PUBLIC_SCOPE = "public"
+
+
+class CacheBackend(ABC):
+    """
+    Storage used by ResponseCache. Subclass this for a shared store (e.g.
+    Redis) and point RESPONSE_CACHE_BACKEND at it as "module:ClassName";
+    the class is constructed with the configured max entries.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Entry stored under `key`, None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        """Store `entry` for `ttl` seconds"""
+
+    @abstractmethod
+    async def counter(self, key: str) -> int:
+        """Current value of a counter, 0 if never bumped"""
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically bump and return a counter (used for scope generations)"""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process LRU + TTL store"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, CacheEntry]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, entry: CacheEntry, ttl: float) -> None:
+        self._entries[key] = (time.monotonic() + ttl, entry)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class ResponseCache:
+    """
+    Caches serialized JSON responses of read-mostly GET endpoints.
+
+    Keys are scoped ("public" or "user:<id>") and include the scope's
+    generation number, so invalidating a user is one counter bump instead of
+    a key scan, which also works on shared backends. Every response carries
+    an ETag; a matching If-None-Match gets an empty 304. Clients and proxies
+    must revalidate on every use (no-cache), so an invalidation here is seen
+    immediately instead of after a max-age.
+    """
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._adapters: Dict[Any, TypeAdapter] = {}
+
+    def _adapter(self, model) -> TypeAdapter:
+        if model not in self._adapters:
+            self._adapters[model] = TypeAdapter(model)
+        return self._adapters[model]
+
+    async def _key(self, request: Request, scope: str, version: str) -> str:
+        generation = await self.backend.counter(f"gen:{scope}")
+        return f"{scope}:{generation}:{version}:{request.url.path}?{request.url.query}"
+
+    async def respond(
+        self,
+        request: Request,
+        build: Callable[[], Any],
+        model: Any,
+        ttl: float,
+        user_id=None,
+        version: str = "",
+    ) -> Response:
+        """
+        Serve `build()` (sync or async) validated against `model`, from cache
+        when possible. Pass `user_id` for per-user data; `version` lets the
+        caller key on a data version it already knows (e.g. catalogue reload).
+        """
+        scope = f"user:{user_id}" if user_id is not None else PUBLIC_SCOPE
+        entry = None
+        key = None
+
+        if self.enabled:
+            key = await self._key(request, scope, version)
+            entry = await self.backend.get(key)
+
+        if entry is None:
+            self.misses += 1
+            data = build()
+            if inspect.isawaitable(data):
+                data = await data
+            adapter = self._adapter(model)
+            body = adapter.dump_json(adapter.validate_python(data, from_attributes=True))
+            entry = (f'"{hashlib.sha1(body).hexdigest()}"', body)
+            if self.enabled:
+                await self.backend.set(key, entry, ttl)
+        else:
+            self.hits += 1
+
+        etag, body = entry
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "private, no-cache" if user_id is not None else "public, no-cache",
+        }
+        if_none_match = _parse_if_none_match(request.headers.get("if-none-match"))
+        if etag in if_none_match or "*" in if_none_match:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    async def invalidate_user(self, user_id) -> None:
+        await self._bump(f"user:{user_id}")
+
+    async def invalidate_public(self) -> None:
+        await self._bump(PUBLIC_SCOPE)
+
+    async def _bump(self, scope: str) -> None:
+        # Entries under the old generation are never read again and age out
+        if self.enabled:
+            await self.backend.incr(f"gen:{scope}")
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def _parse_if_none_match(value: Optional[str]) -> set:
+    if not value:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in value.split(",")}
+
+
+def _create_backend() -> CacheBackend:
+    if settings.RESPONSE_CACHE_BACKEND:
+        module_name, class_name = settings.RESPONSE_CACHE_BACKEND.split(":")
+        backend_class = getattr(importlib.import_module(module_name), class_name)
+        return backend_class(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    return InMemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(_create_backend(), enabled=settings.RESPONSE_CACHE_ENABLED)
@@ -0,0 +1,52 @@
+import json
+from typing import Any, Type
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib encoder is used instead
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Types orjson does not handle natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    return jsonable_encoder(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson: UUID, datetime/date, dataclasses and
+    NumPy arrays/scalars are encoded natively, pydantic models via
+    model_dump(). Falls back to the stdlib encoder when orjson is missing.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        return json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """Response class for the whole app, chosen by JSON_RESPONSE_CLASS"""
+    if settings.JSON_RESPONSE_CLASS == "orjson" and orjson is not None:
+        return FastJSONResponse
+    return JSONResponse
+
+
+def prevalidated(content: Any, status_code: int = 200) -> JSONResponse:
+    """
+    Return data that already has the response model's shape (plain dicts built
+    by the handler, or pydantic models) without FastAPI re-validating it
+    against `response_model`. The route's response_model still documents it.
+    Rendered with the class JSON_RESPONSE_CLASS selects.
+    """
+    response_class = default_response_class()
+    if response_class is JSONResponse:
+        # The stdlib encoder needs plain types
+        content = jsonable_encoder(content)
+    return response_class(content, status_code=status_code)
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from jose import jwt, JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+
+from app.core.auth_gateway import auth_gateway, AuthRejected
+from app.core.config import settings
+from app.schemas.auth import TokenPayload
+
+
+class TokenVerificationError(Exception):
+    """The token is invalid, expired or was rejected by Supabase"""
+
+
+class LocalVerificationUnavailable(Exception):
+    """The token cannot be checked in-process (no secret, unknown key, JWKS down)"""
+
+
+class JWKSCache:
+    """
+    Caches the Supabase project's JSON Web Key Set and refreshes it
+    periodically, or early when a token references an unknown key id.
+    """
+
+    # Don't hammer the JWKS endpoint when tokens carry unknown key ids
+    MIN_REFRESH_INTERVAL = 30
+
+    def __init__(self, url: str, ttl_seconds: int):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_stale(self) -> bool:
+        return time.monotonic() - self._fetched_at > self.ttl_seconds
+
+    async def _refresh(self):
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+        self._keys = {key["kid"]: key for key in response.json().get("keys", []) if "kid" in key}
+        self._fetched_at = time.monotonic()
+
+    async def get_key(self, kid: str) -> Dict[str, Any]:
+        if kid in self._keys and not self._is_stale():
+            return self._keys[kid]
+
+        async with self._lock:
+            # Another request may have refreshed while we waited for the lock
+            recently_fetched = time.monotonic() - self._fetched_at < self.MIN_REFRESH_INTERVAL
+            if self._is_stale() or (kid not in self._keys and not recently_fetched):
+                try:
+                    await self._refresh()
+                except (httpx.HTTPError, ValueError) as e:
+                    if kid not in self._keys:
+                        raise LocalVerificationUnavailable(f"JWKS unavailable: {e}")
+
+        if kid not in self._keys:
+            raise LocalVerificationUnavailable(f"Unknown signing key: {kid}")
+        return self._keys[kid]
+
+
+class SupabaseTokenVerifier:
+    """
+    Verifies Supabase access tokens in-process.
+
+    HS256 tokens are checked against the project JWT secret, asymmetric
+    tokens against the cached JWKS. When local verification is not possible
+    and AUTH_REMOTE_FALLBACK is enabled, Supabase Auth is asked instead.
+    """
+
+    def __init__(self):
+        self.mode = settings.AUTH_VERIFY_MODE
+        self.remote_fallback = settings.AUTH_REMOTE_FALLBACK
+        self.secret = settings.SUPABASE_JWT_SECRET
+        self.audience = settings.SUPABASE_JWT_AUDIENCE
+        self.jwks = JWKSCache(
+            f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json",
+            settings.JWKS_CACHE_TTL_SECONDS,
+        )
+
+    async def verify(self, token: str) -> TokenPayload:
+        if self.mode == "remote":
+            return await self._verify_remote(token)
+
+        try:
+            return await self._verify_local(token)
+        except LocalVerificationUnavailable:
+            if not self.remote_fallback:
+                raise TokenVerificationError("Token cannot be verified locally")
+            return await self._verify_remote(token)
+
+    async def _verify_local(self, token: str) -> TokenPayload:
+        try:
+            header = jwt.get_unverified_header(token)
+        except JWTError as e:
+            raise TokenVerificationError(f"Malformed token: {e}")
+
+        algorithm = header.get("alg")
+        if algorithm == "HS256":
+            if not self.secret:
+                raise LocalVerificationUnavailable("SUPABASE_JWT_SECRET is not configured")
+            key: Any = self.secret
+        elif algorithm in ("RS256", "ES256"):
+            key = await self.jwks.get_key(header.get("kid", ""))
+        else:
+            raise TokenVerificationError(f"Unsupported token algorithm: {algorithm}")
+
+        try:
+            claims = jwt.decode(token, key, algorithms=[algorithm], audience=self.audience)
+        except ExpiredSignatureError:
+            raise TokenVerificationError("Token has expired")
+        except (JWTClaimsError, JWTError) as e:
+            raise TokenVerificationError(f"Invalid token: {e}")
+
+        return TokenPayload(**claims)
+
+    async def _verify_remote(self, token: str) -> TokenPayload:
+        # AuthGatewayUnavailable propagates: provider trouble is not a bad token
+        try:
+            user = await auth_gateway.get_user(token)
+        except AuthRejected as e:
+            raise TokenVerificationError(str(e))
+
+        if not user or not user.get("id"):
+            raise TokenVerificationError("Token rejected by Supabase")
+
+        return TokenPayload(
+            sub=str(user["id"]),
+            email=user.get("email"),
+            user_metadata=user.get("user_metadata") or {},
+        )
+
+
+token_verifier = SupabaseTokenVerifier()
@@ -1,9 +1,13 @@
+from typing import Optional
 from supabase import create_client, Client
 from app.core.config import settings
 
-# Initialize Supabase client
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# Built on first use; request paths talk to Supabase Auth through app.core.auth_gateway
+_supabase: Optional[Client] = None
 
 def get_supabase_client() -> Client:
     """Get Supabase client instance"""
-    return supabase
+    global _supabase
+    if _supabase is None:
+        _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return _supabase
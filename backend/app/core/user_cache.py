@@ -0,0 +1,78 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from app.core.config import settings
+from app.db.models import User
+
+
+class UserCache:
+    """
+    LRU + TTL cache of resolved users keyed by token subject.
+
+    Entries are detached snapshots of the `User` row: they are not bound to
+    any session, so they must be treated as read-only. Write paths reload
+    the user from their own session instead.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, subject: str) -> Optional[User]:
+        entry = self._entries.get(subject)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del self._entries[subject]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        return user
+
+    def set(self, subject: str, user: User) -> User:
+        snapshot = snapshot_user(user)
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, snapshot)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return snapshot
+
+    def invalidate(self, subject) -> None:
+        self._entries.pop(str(subject), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def snapshot_user(user: User) -> User:
+    """Copy the column values of a loaded user into a new, session-less instance"""
+    return User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+
+
+user_cache = UserCache(settings.USER_CACHE_MAX_SIZE, settings.USER_CACHE_TTL_SECONDS)
+
+
+# Any ORM-level profile change drops the stale snapshot
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    user_cache.invalidate(target.id)
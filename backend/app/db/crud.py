@@ -1,8 +1,116 @@
-# Generic CRUD or specific CRUD utils if needed
-# The specific logic was embedded in API mainly for simplicity as per "Direct Generate" mode
-# But creating this file to satisfy structure
+"""
+Persistence helpers shared by the routers and services.
+
+Writes use INSERT ... RETURNING, so ids and server defaults (created_at,
+status, ...) come back with the insert itself; together with
+expire_on_commit=False on the session, objects stay usable after commit
+without a refresh SELECT.
+"""
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import FinancialBehavior, LoanApplication, Transaction, UploadJob, User
+
+ModelType = TypeVar("ModelType")
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+BEHAVIOR_FIELDS = ["total_score", "behavior_rating", "category_scores", "liquidity_resilience_days"]
+
+# Returned rows replace whatever the session already holds for that identity
+RETURNING_OPTIONS = {"populate_existing": True}
+
+
+class CRUDBase(Generic[ModelType]):
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: AsyncSession, id) -> Optional[ModelType]:
+        result = await db.execute(select(self.model).where(self.model.id == id))
+        return result.scalars().first()
+
+    async def create(self, db: AsyncSession, values: Dict[str, Any], commit: bool = True) -> ModelType:
+        """Insert one row and return it fully populated"""
+        result = await db.execute(
+            insert(self.model).values(**values).returning(self.model),
+            execution_options=RETURNING_OPTIONS
+        )
+        obj = result.scalars().one()
+        if commit:
+            await db.commit()
+        return obj
+
+    async def create_many(self, db: AsyncSession, rows: List[Dict[str, Any]], commit: bool = True) -> List[ModelType]:
+        """Multi-row INSERT ... RETURNING, objects come back in input order"""
+        result = await db.execute(
+            insert(self.model).returning(self.model, sort_by_parameter_order=True),
+            rows,
+            execution_options=RETURNING_OPTIONS
+        )
+        objs = result.scalars().all()
+        if commit:
+            await db.commit()
+        return objs
+
+
+class CRUDUser(CRUDBase[User]):
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
+        result = await db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+
+class CRUDTransaction(CRUDBase[Transaction]):
+    async def get_by_content_hash(self, db: AsyncSession, user_id, content_hash: str) -> Optional[Transaction]:
+        result = await db.execute(
+            select(Transaction).where(Transaction.user_id == user_id, Transaction.content_hash == content_hash)
+        )
+        return result.scalars().first()
+
+
+class CRUDUploadJob(CRUDBase[UploadJob]):
+    async def get_by_content_hash(self, db: AsyncSession, user_id, content_hash: str) -> Optional[UploadJob]:
+        """Latest job for the same file that has not failed"""
+        result = await db.execute(
+            select(UploadJob)
+            .where(UploadJob.user_id == user_id, UploadJob.content_hash == content_hash, UploadJob.status != "failed")
+            .order_by(UploadJob.created_at.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+
+class CRUDFinancialBehavior(CRUDBase[FinancialBehavior]):
+    async def get_by_user(self, db: AsyncSession, user_id) -> Optional[FinancialBehavior]:
+        result = await db.execute(select(FinancialBehavior).where(FinancialBehavior.user_id == user_id))
+        return result.scalars().first()
+
+    async def upsert(self, db: AsyncSession, user_id, analysis: Dict[str, Any]) -> FinancialBehavior:
+        """
+        Create or overwrite the user's behaviour summary in one statement.
+
+        Relies on the unique index on financial_behavior(user_id); concurrent
+        uploads for the same user serialize on that row instead of racing a
+        SELECT. Runs in the caller's transaction, nothing is committed here.
+        """
+        values = {field: analysis[field] for field in BEHAVIOR_FIELDS}
+        dialect = (await db.connection()).dialect.name
+        stmt = UPSERT_INSERTS[dialect](FinancialBehavior).values(user_id=user_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FinancialBehavior.user_id],
+            set_={**values, "updated_at": func.now()},
+        ).returning(FinancialBehavior)
+
+        result = await db.execute(stmt, execution_options=RETURNING_OPTIONS)
+        return result.scalars().one()
+
 
-# Placeholder for future expansion or refactoring logic out of API routes
-class CRUDUser:
-    pass
+user = CRUDUser(User)
+loan = CRUDBase(LoanApplication)
+transaction = CRUDTransaction(Transaction)
+financial_behavior = CRUDFinancialBehavior(FinancialBehavior)
+upload_job = CRUDUploadJob(UploadJob)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Date, DateTime, ForeignKey, Boolean, LargeBinary, Index, JSON
 from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 from app.db.session import Base
 
+# JSONB on PostgreSQL, plain JSON elsewhere (SQLite in tests)
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class User(Base):
     __tablename__ = "users"
 
@@ -35,20 +38,64 @@ class LoanApplication(Base):
     ml_score = Column(Float, nullable=True)
     acceptance_rate = Column(Float, nullable=True)
     status = Column(String, default="pending")
-    feedback = Column(JSONB, nullable=True)
+    feedback = Column(JSONType, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="loans")
 
+    __table_args__ = (
+        # Keyset pagination of a user's applications, newest first
+        Index("ix_loan_applications_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
 class Transaction(Base):
     __tablename__ = "transactions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     file_name = Column(String, nullable=False)
-    transaction_data = Column(JSONB, nullable=False)
-    analysis_result = Column(JSONB, nullable=True)
+    # Legacy, statement lines now live in transaction_lines. Deferred so reads
+    # (e.g. /analyze) never load old uploads' full line blobs
+    transaction_data = deferred(Column(JSONType, nullable=True))
+    analysis_result = Column(JSONType, nullable=True)
+    content_hash = Column(String(64), nullable=True) # SHA-256 of the uploaded file
+
+    # Statement metadata / aggregates
+    row_count = Column(Integer, nullable=True)
+    period_start = Column(Date, nullable=True)
+    period_end = Column(Date, nullable=True)
+    total_income = Column(Float, nullable=True)
+    total_expense = Column(Float, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     user = relationship("User", back_populates="transactions")
+    lines = relationship("TransactionLine", back_populates="transaction", passive_deletes=True)
+
+    __table_args__ = (
+        Index("ix_transactions_user_id_created_at_id", "user_id", "created_at", "id"),
+        # A file is stored once per user, re-uploads return the existing row
+        Index("uq_transactions_user_id_content_hash", "user_id", "content_hash", unique=True),
+    )
+
+class TransactionLine(Base):
+    __tablename__ = "transaction_lines"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    line_no = Column(Integer, nullable=False)
+    date = Column(Date, nullable=True)
+    description = Column(String, nullable=True)
+    amount = Column(Float, nullable=True)
+    type = Column(String, nullable=True) # CR / DR
+    category = Column(String, nullable=True)
+    extra = Column(JSONType, nullable=True) # any other columns of the bank export
+
+    transaction = relationship("Transaction", back_populates="lines")
+
+    __table_args__ = (
+        Index("ix_transaction_lines_user_id_date", "user_id", "date"),
+    )
 
 class FinancialBehavior(Base):
     __tablename__ = "financial_behavior"
@@ -57,7 +104,62 @@ class FinancialBehavior(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     total_score = Column(Float, nullable=True) # 0-10
     behavior_rating = Column(String, nullable=True) # good/average/bad
-    category_scores = Column(JSONB, nullable=True)
+    category_scores = Column(JSONType, nullable=True)
     liquidity_resilience_days = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     user = relationship("User", back_populates="financial_behavior")
+
+    __table_args__ = (
+        # One behaviour summary per user
+        Index("uq_financial_behavior_user_id", "user_id", unique=True),
+    )
+
+class UserMonthlyAggregate(Base):
+    """Running per-user, per-month totals; uploads add their new lines here"""
+    __tablename__ = "user_monthly_aggregates"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    month = Column(Date, primary_key=True) # first day of the month
+    income = Column(Float, nullable=False, default=0.0)
+    expense = Column(Float, nullable=False, default=0.0)
+    category_expense = Column(JSONType, nullable=False) # category -> spend
+    row_count = Column(Integer, nullable=False, default=0)
+    first_date = Column(Date, nullable=True)
+    last_date = Column(Date, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class TransactionFingerprint(Base):
+    """Statement lines already counted in the aggregates, so overlapping statements are not double-counted"""
+    __tablename__ = "transaction_fingerprints"
+
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    fingerprint = Column(String(32), primary_key=True)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id", ondelete="SET NULL"), nullable=True)
+
+class UploadJob(Base):
+    __tablename__ = "upload_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    file_name = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued") # queued/processing/completed/failed
+    progress = Column(Integer, nullable=False, default=0) # 0-100
+    attempts = Column(Integer, nullable=False, default=0)
+    payload = Column(LargeBinary, nullable=True) # raw upload, cleared once processed
+    content_hash = Column(String(64), nullable=True) # SHA-256 of the payload
+    result = Column(JSONType, nullable=True)
+    error = Column(String, nullable=True)
+    transaction_id = Column(UUID(as_uuid=True), ForeignKey("transactions.id"), nullable=True)
+    lease_owner = Column(UUID(as_uuid=True), nullable=True) # set on every claim
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True) # renewed while the job runs
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # Workers claim the oldest queued job
+        Index("ix_upload_jobs_status_created_at", "status", "created_at"),
+        # Re-uploads of a file that is still queued join the existing job
+        Index("ix_upload_jobs_user_id_content_hash", "user_id", "content_hash"),
+    )
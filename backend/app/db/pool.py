@@ -0,0 +1,66 @@
+import time
+from typing import Any, Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+class PoolMetrics:
+    """Counters collected from the connection pool"""
+
+    def __init__(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_wait(self, seconds: float):
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that counts checkouts/connects and times how long callers wait"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _create_connection(self):
+        self.metrics.connects += 1
+        return super()._create_connection()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+            self.metrics.checkouts += 1
+            if self.overflow() > 0:
+                self.metrics.overflow_checkouts += 1
+            return connection
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if hasattr(pool, "size"):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(vars(metrics))
+    return stats
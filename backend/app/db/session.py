@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.pool import InstrumentedQueuePool, pool_stats
 
 # Ensure the URL is async-compatible (psycopg3 uses different driver)
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
@@ -9,17 +11,55 @@ if SQLALCHEMY_DATABASE_URL and SQLALCHEMY_DATABASE_URL.startswith("postgresql://
 elif SQLALCHEMY_DATABASE_URL and SQLALCHEMY_DATABASE_URL.startswith("postgresql+asyncpg://"):
     SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql+psycopg://", 1)
 
-# Supabase requires SSL
+
+def build_engine_kwargs(url: str, options: dict) -> dict:
+    """Translate the configured pool profile into create_async_engine arguments"""
+    kwargs = {"echo": options["echo"]}
+
+    if not url.startswith("postgresql"):
+        # SQLite (tests, benchmarks) keeps SQLAlchemy's default pooling
+        return kwargs
+
+    connect_args = {}
+    if settings.DB_SSLMODE:
+        connect_args["sslmode"] = settings.DB_SSLMODE
+
+    if settings.DB_PGBOUNCER:
+        # Transaction pooling hands each transaction a different server
+        # connection, so server-side prepared statements must be off and
+        # session-level startup options are rejected by PgBouncer
+        connect_args["prepare_threshold"] = None
+    elif options["statement_timeout_ms"]:
+        connect_args["options"] = f"-c statement_timeout={options['statement_timeout_ms']}"
+
+    kwargs.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_timeout=options["pool_timeout"],
+        pool_recycle=options["pool_recycle"],
+        pool_pre_ping=options["pool_pre_ping"],
+        connect_args=connect_args,
+    )
+    return kwargs
+
+
 engine = create_async_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    echo=True,
-    connect_args={"sslmode": "require"}
+    SQLALCHEMY_DATABASE_URL,
+    **build_engine_kwargs(SQLALCHEMY_DATABASE_URL, settings.db_engine_options())
 )
+# Query counts/latency for /metrics
+instrument_engine(engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=AsyncSession)
+# Objects stay loaded after commit; writes return their columns via RETURNING (see crud.py)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=AsyncSession)
 
 Base = declarative_base()
 
 async def get_db():
     async with SessionLocal() as session:
         yield session
+
+def get_pool_stats() -> dict:
+    """Checked-out/overflow counts and wait times of the engine's pool"""
+    return pool_stats(engine.pool)
@@ -5,20 +5,26 @@ import asyncio
 if sys.platform == 'win32':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.core.auth_gateway import auth_gateway
 from app.core.config import settings
-from app.api import auth, user, loans, transactions, banks
-from app.db.session import engine, Base
+from app.core.executor import executor, ExecutorSaturated
+from app.core.metrics import MetricsMiddleware
+from app.core.responses import default_response_class
+from app.db.session import engine
+from app.api import auth, user, loans, transactions, banks, monitoring
+from app.services.upload_jobs import upload_job_worker
 
-# Create tables logic usually goes into alembic migrations for production, 
-# but for this standalone task without alembic explicitly req, we can init here or assume existing.
-# However, async requires specific init. 
-# We'll skip auto-create on start to adhere to 'production-ready' usually implying migrations,
-# but since I need to make it RUNNABLE without external migration steps from the user (zero setup implicit),
-# I will include a startup event to create tables if they don't exist for convenience in this specific "generate backend" task.
+# The schema is managed by Alembic (see migrations/), run `alembic upgrade head`
+# before starting the app.
 
-app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json")
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=default_response_class()
+)
 
 # CORS
 if settings.CORS_ORIGINS:
@@ -28,6 +34,19 @@ if settings.CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
+    )
+
+# Per-route latency and DB usage, exposed on /api/metrics
+app.add_middleware(MetricsMiddleware)
+
+# Backpressure from the worker pools
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
     )
 
 # Routes
@@ -36,12 +55,16 @@ app.include_router(user.router, prefix=f"{settings.API_V1_STR}/user", tags=["use
 app.include_router(loans.router, prefix=f"{settings.API_V1_STR}/loans", tags=["loans"])
 app.include_router(transactions.router, prefix=f"{settings.API_V1_STR}/transactions", tags=["transactions"])
 app.include_router(banks.router, prefix=f"{settings.API_V1_STR}/banks", tags=["banks"])
-
-@app.get(f"{settings.API_V1_STR}/health")
-async def health_check():
-    return {"status": "ok"}
+app.include_router(monitoring.router, prefix=settings.API_V1_STR, tags=["monitoring"])
 
 @app.on_event("startup")
-async def init_tables():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+async def start_upload_jobs():
+    if settings.UPLOAD_JOBS_ENABLED:
+        upload_job_worker.start()
+
+@app.on_event("shutdown")
+async def shutdown_workers():
+    await upload_job_worker.stop()
+    await auth_gateway.close()
+    await engine.dispose()
+    executor.shutdown(wait=False)
@@ -1,69 +1,130 @@
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from app.ml.categorizer import categorizer
+
+# Categorize (Simple keyword based, rules live in app/data/category_rules.json)
+def categorize(desc):
+    return categorizer.categorize(desc)
+
+
+class BehaviorAccumulator:
+    """
+    Online version of `analyze_behavior`.
+
+    Feed statement chunks with `update()`, combine partial results from other
+    workers with `merge()` and call `finalize()` for the analysis dict. Only
+    running sums, per-category spend and the date range are kept, so memory
+    does not grow with the number of rows.
+    """
+
+    def __init__(self):
+        self.total_income = 0.0
+        self.total_expense = 0.0
+        self.category_totals: Dict[str, float] = {}
+        self.min_date: Optional[pd.Timestamp] = None
+        self.max_date: Optional[pd.Timestamp] = None
+        self.row_count = 0
+
+    @classmethod
+    def from_totals(cls, total_income: float, total_expense: float, category_totals: Dict[str, float],
+                    min_date=None, max_date=None, row_count: int = 0) -> "BehaviorAccumulator":
+        """Accumulator over totals kept elsewhere (e.g. per-user monthly aggregates)"""
+        accumulator = cls()
+        accumulator.total_income = total_income
+        accumulator.total_expense = total_expense
+        accumulator.category_totals = dict(category_totals)
+        accumulator.min_date = min_date
+        accumulator.max_date = max_date
+        accumulator.row_count = row_count
+        return accumulator
+
+    def update(self, df: pd.DataFrame) -> "BehaviorAccumulator":
+        """
+        Expects DataFrame with columns: ['Date', 'Description', 'Amount', 'Type']
+        Type: 'CR' (Credit/Income) or 'DR' (Debit/Expense)
+        """
+        # Basic cleaning
+        df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0)
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+
+        if 'Category' not in df.columns:
+            df['Category'] = categorizer.categorize_series(df['Description'])
+
+        self.total_income += float(df[df['Type'] == 'CR']['Amount'].sum())
+        expenses = df[df['Type'] == 'DR']
+        self.total_expense += float(expenses['Amount'].sum())
+
+        for cat, amount in expenses.groupby('Category')['Amount'].sum().items():
+            self.category_totals[cat] = self.category_totals.get(cat, 0.0) + float(amount)
+
+        self._update_dates(df['Date'].min(), df['Date'].max())
+        self.row_count += len(df)
+        return self
+
+    def merge(self, other: "BehaviorAccumulator") -> "BehaviorAccumulator":
+        self.total_income += other.total_income
+        self.total_expense += other.total_expense
+        for cat, amount in other.category_totals.items():
+            self.category_totals[cat] = self.category_totals.get(cat, 0.0) + amount
+        self._update_dates(other.min_date, other.max_date)
+        self.row_count += other.row_count
+        return self
+
+    def _update_dates(self, min_date, max_date):
+        if min_date is not None and not pd.isna(min_date):
+            self.min_date = min_date if self.min_date is None else min(self.min_date, min_date)
+        if max_date is not None and not pd.isna(max_date):
+            self.max_date = max_date if self.max_date is None else max(self.max_date, max_date)
+
+    def finalize(self) -> Dict[str, Any]:
+        total_income = self.total_income
+        total_expense = self.total_expense
+
+        # 1. Total Score (0-10) based on Savings Rate and Stability
+        savings_rate = (total_income - total_expense) / total_income if total_income > 0 else 0
+        score = min(10, max(0, 5 + (savings_rate * 10))) # Base 5, add/subtract based on savings
+
+        # 2. Category Scores
+        category_gb = pd.Series(self.category_totals, dtype='float64').sort_index()
+        total_spend = category_gb.sum()
+        category_scores = {}
+        for cat, amount in category_gb.items():
+            # Lower portion of spend is better for non-essentials
+            ratio = amount / total_spend if total_spend > 0 else 0
+            if cat in ['Investments']:
+                c_score = min(10, ratio * 20) # Higher is better
+            elif cat in ['Loan']:
+                c_score = max(0, 10 - (ratio * 20)) # Lower is better
+            else:
+                c_score = 5 # Neutral
+            category_scores[cat] = float(c_score)
+
+        # 3. Liquidity Resilience (Days cash can cover avg daily expense)
+        days_range = (self.max_date - self.min_date).days if self.min_date is not None else 0
+        if days_range > 0:
+            daily_expense = total_expense / days_range
+            balance = total_income - total_expense
+            resilience_days = int(balance / daily_expense) if daily_expense > 0 else 30 # Default cap
+        else:
+            resilience_days = 0
+
+        # 4. Rating
+        if score >= 7: rating = "Good"
+        elif score >= 4: rating = "Average"
+        else: rating = "Bad"
+
+        return {
+            "total_score": round(score, 1),
+            "behavior_rating": rating,
+            "category_scores": category_scores,
+            "liquidity_resilience_days": resilience_days,
+            "stable_inflow": total_income > 0
+        }
+
 
 def analyze_behavior(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Expects DataFrame with columns: ['Date', 'Description', 'Amount', 'Type']
     Type: 'CR' (Credit/Income) or 'DR' (Debit/Expense)
     """
-    
-    # Basic cleaning
-    df['Amount'] = pd.to_numeric(df['Amount'], errors='coerce').fillna(0)
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    
-    # Categorize (Simple keyword based)
-    def categorize(desc):
-        desc = str(desc).lower()
-        if 'salary' in desc or 'deposit' in desc: return 'Income'
-        if 'food' in desc or 'grocer' in desc: return 'Food'
-        if 'uber' in desc or 'fuel' in desc: return 'Transport'
-        if 'emi' in desc or 'loan' in desc: return 'Loan'
-        if 'invest' in desc or 'stock' in desc: return 'Investments'
-        return 'Others'
-
-    if 'Category' not in df.columns:
-        df['Category'] = df['Description'].apply(categorize)
-
-    # 1. Total Score (0-10) based on Savings Rate and Stability
-    total_income = df[df['Type'] == 'CR']['Amount'].sum()
-    total_expense = df[df['Type'] == 'DR']['Amount'].sum()
-    
-    savings_rate = (total_income - total_expense) / total_income if total_income > 0 else 0
-    score = min(10, max(0, 5 + (savings_rate * 10))) # Base 5, add/subtract based on savings
-
-    # 2. Category Scores
-    category_gb = df[df['Type'] == 'DR'].groupby('Category')['Amount'].sum()
-    total_spend = category_gb.sum()
-    category_scores = {}
-    for cat, amount in category_gb.items():
-        # Lower portion of spend is better for non-essentials
-        ratio = amount / total_spend if total_spend > 0 else 0
-        if cat in ['Investments']:
-            c_score = min(10, ratio * 20) # Higher is better
-        elif cat in ['Loan']:
-            c_score = max(0, 10 - (ratio * 20)) # Lower is better
-        else:
-            c_score = 5 # Neutral
-        category_scores[cat] = float(c_score)
-
-    # 3. Liquidity Resilience (Days cash can cover avg daily expense)
-    days_range = (df['Date'].max() - df['Date'].min()).days
-    if days_range > 0:
-        daily_expense = total_expense / days_range
-        balance = total_income - total_expense
-        resilience_days = int(balance / daily_expense) if daily_expense > 0 else 30 # Default cap
-    else:
-        resilience_days = 0
-
-    # 4. Rating
-    if score >= 7: rating = "Good"
-    elif score >= 4: rating = "Average"
-    else: rating = "Bad"
-
-    return {
-        "total_score": round(score, 1),
-        "behavior_rating": rating,
-        "category_scores": category_scores,
-        "liquidity_resilience_days": resilience_days,
-        "stable_inflow": total_income > 0
-    }
+    return BehaviorAccumulator().update(df).finalize()
@@ -0,0 +1,89 @@
+import json
+import re
+from typing import Any, Dict, List, Pattern, Tuple
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+
+
+def _compile_rules(rules: List[Dict[str, Any]]) -> List[Tuple[str, Pattern]]:
+    """
+    One regex alternation per category, in rule order, e.g.
+    ("Income", re.compile("salary|deposit")). Keywords are matched literally
+    as lower-case substrings. Raises ValueError for malformed rules.
+    """
+    if not isinstance(rules, list):
+        raise ValueError("Category rules must be a list")
+
+    compiled = []
+    for position, rule in enumerate(rules):
+        if not isinstance(rule, dict) or not isinstance(rule.get("category"), str):
+            raise ValueError(f"Category rule {position} needs a string 'category'")
+        keywords = rule.get("keywords") or []
+        if not isinstance(keywords, list) or not all(isinstance(keyword, str) and keyword for keyword in keywords):
+            raise ValueError(f"Category rule {position} ({rule['category']}): 'keywords' must be non-empty strings")
+        if keywords:
+            compiled.append((rule["category"], re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords))))
+    return compiled
+
+
+class KeywordCategorizer:
+    """
+    Keyword rule engine for transaction descriptions.
+
+    Rules are tried in order and the first one with a keyword contained in the
+    lower-cased description wins. Whole columns are classified one rule at a
+    time with vectorized string matching, each rule only seeing the rows no
+    earlier rule claimed.
+    """
+
+    # Rows sampled to decide whether deduplicating a column pays off
+    SAMPLE_SIZE = 2048
+
+    def __init__(self, rules: List[Dict[str, Any]], default: str = "Others"):
+        if not isinstance(default, str):
+            raise ValueError("The default category must be a string")
+        self.rules = rules
+        self.default = default
+        self._patterns = _compile_rules(rules)
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordCategorizer":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config["rules"], config.get("default", "Others"))
+
+    def categorize(self, desc) -> str:
+        text = str(desc).lower()
+        for category, pattern in self._patterns:
+            if pattern.search(text):
+                return category
+        return self.default
+
+    def _labels(self, values: np.ndarray) -> np.ndarray:
+        # Same text as categorize(): str() of the value, lower-cased
+        remaining = pd.Series(values, dtype=object).astype(str).str.lower()
+        labels = np.full(len(values), self.default, dtype=object)
+        for category, pattern in self._patterns:
+            if remaining.empty:
+                break
+            hits = remaining.str.contains(pattern).to_numpy(dtype=bool)
+            labels[remaining.index.to_numpy()[hits]] = category
+            remaining = remaining[~hits]
+        return labels
+
+    def categorize_series(self, descriptions: pd.Series) -> pd.Series:
+        values = descriptions.to_numpy(dtype=object)
+
+        sample = values[:self.SAMPLE_SIZE]
+        if len(pd.unique(sample)) * 2 <= len(sample):
+            # Statements repeat the same merchants, so match distinct values only
+            codes, uniques = pd.factorize(values, use_na_sentinel=False)
+            result = self._labels(np.asarray(uniques, dtype=object))[codes]
+        else:
+            result = self._labels(values)
+
+        return pd.Series(result, index=descriptions.index)
+
+
+categorizer = KeywordCategorizer.from_file(settings.CATEGORY_RULES_PATH)
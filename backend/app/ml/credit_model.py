@@ -1,5 +1,14 @@
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+
+# Column order expected by the model
+FEATURE_COLUMNS = [
+    "annual_income",
+    "total_assets",
+    "total_debt_amount",
+    "num_debts",
+    "monthly_emis",
+    "amount_requested",
+]
 
 class CreditScoringModel:
     def __init__(self):
@@ -12,7 +21,7 @@ class CreditScoringModel:
             -0.20, # monthly_emis (normalized) - negative impact
             -0.20  # amount_requested (normalized) - negative impact
         ])
-        
+
         # Approximate bounds for normalization
         self.bounds = np.array([
             [10000, 2000000],   # annual_income (monthly * 12)
@@ -23,6 +32,23 @@ class CreditScoringModel:
             [10000, 1000000]    # amount_requested
         ])
 
+        # Precomputed so the kernel is a single clip/dot/sigmoid pass
+        self._lower = self.bounds[:, 0].astype(float)
+        self._span = (self.bounds[:, 1] - self.bounds[:, 0]).astype(float)
+
+    def _score(self, features: np.ndarray) -> np.ndarray:
+        """Score an (N, 6) feature matrix, returns N probabilities"""
+        # Simple min-max normalization based on bounds
+        # Clip to ensure we stay within expected range
+        normalized = np.clip((features - self._lower) / self._span, 0.0, 1.0)
+
+        # Dot product with weights
+        # Adjust base score so 0.5 is average
+        score = normalized @ self.weights
+
+        # Sigmoid-like transformation to map to 0-1 probability
+        return 1 / (1 + np.exp(-5 * (score + 0.1))) # Shift and scale to center
+
     def predict(self, input_data: list) -> float:
         """
         Input order:
@@ -33,26 +59,26 @@ class CreditScoringModel:
         5. monthly_emis
         6. amount_requested
         """
-        features = np.array(input_data)
-        
-        # Simple min-max normalization based on bounds
-        # Clip to ensure we stay within expected range
-        normalized = []
-        for i, val in enumerate(features):
-            min_v, max_v = self.bounds[i]
-            norm_val = (val - min_v) / (max_v - min_v)
-            norm_val = max(0.0, min(1.0, norm_val))
-            normalized.append(norm_val)
-            
-        normalized = np.array(normalized)
-        
-        # Dot product with weights
-        # Adjust base score so 0.5 is average
-        score = np.dot(normalized, self.weights)
-        
-        # Sigmoid-like transformation to map to 0-1 probability
-        final_score = 1 / (1 + np.exp(-5 * (score + 0.1))) # Shift and scale to center
-        
-        return float(final_score)
+        features = np.asarray(input_data, dtype=float).reshape(1, -1)
+        return float(self._score(features)[0])
+
+    def predict_batch(self, data) -> np.ndarray:
+        """
+        Score many applicants at once.
+
+        Accepts an (N, 6) array in the same order as `predict`, or a
+        DataFrame with FEATURE_COLUMNS (`monthly_income` is accepted in
+        place of `annual_income`).
+        """
+        if hasattr(data, "columns"):
+            if "annual_income" not in data.columns and "monthly_income" in data.columns:
+                data = data.assign(annual_income=data["monthly_income"] * 12)
+            data = data[FEATURE_COLUMNS].to_numpy()
+
+        features = np.asarray(data, dtype=float)
+        if features.ndim != 2 or features.shape[1] != len(FEATURE_COLUMNS):
+            raise ValueError(f"Expected an (N, {len(FEATURE_COLUMNS)}) feature matrix, got {features.shape}")
+
+        return self._score(features)
 
 credit_model = CreditScoringModel()
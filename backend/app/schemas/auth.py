@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
 class Token(BaseModel):
@@ -8,6 +8,13 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     id: Optional[str] = None
 
+class TokenPayload(BaseModel):
+    """Verified claims of a Supabase access token"""
+    sub: str
+    email: Optional[str] = None
+    user_metadata: Dict[str, Any] = {}
+    exp: Optional[int] = None
+
 class Login(BaseModel):
     email: str
     password: str
@@ -1,6 +1,8 @@
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field
 from uuid import UUID
+from datetime import datetime
+from app.core.config import settings
 
 class LoanApplicationBase(BaseModel):
     amount_requested: float
@@ -20,6 +22,30 @@ class LoanApplicationResponse(LoanApplicationBase):
     acceptance_rate: Optional[float] = None
     status: str
     feedback: Optional[Dict[str, Any]] = None
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class LoanScoreBatchRequest(BaseModel):
+    applications: List[LoanApplicationCreate] = Field(..., max_length=settings.SCORE_BATCH_MAX_SIZE)
+
+class LoanScore(BaseModel):
+    ml_score: float
+    acceptance_rate: float
+    status: str
+
+class LoanScoreBatchResponse(BaseModel):
+    scores: List[LoanScore]
+
+class LoanBulkResult(BaseModel):
+    index: int
+    status: str # created / invalid / failed
+    loan: Optional[LoanApplicationResponse] = None
+    error: Optional[str] = None
+
+class LoanBulkApplyResponse(BaseModel):
+    created: int
+    failed: int
+    truncated: bool = False
+    results: List[LoanBulkResult]
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 from uuid import UUID
+from datetime import date, datetime
 
 class TransactionBase(BaseModel):
     file_name: str
@@ -16,6 +17,19 @@ class TransactionResponse(TransactionBase):
     class Config:
         from_attributes = True
 
+class TransactionSummaryResponse(TransactionBase):
+    """Upload listing entry, without the line data or full analysis"""
+    id: UUID
+    row_count: Optional[int] = None
+    period_start: Optional[date] = None
+    period_end: Optional[date] = None
+    total_income: Optional[float] = None
+    total_expense: Optional[float] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
 class FinancialBehaviorResponse(BaseModel):
     id: UUID
     user_id: UUID
@@ -26,3 +40,17 @@ class FinancialBehaviorResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class UploadJobResponse(BaseModel):
+    id: UUID
+    file_name: str
+    status: str
+    progress: int
+    transaction_id: Optional[UUID] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,188 @@
+"""
+Rolling per-user financial aggregates.
+
+Each upload folds only its *new* lines into per-month totals
+(user_monthly_aggregates); lines whose fingerprint was already recorded for
+the user (overlapping statements) are skipped. The behaviour summary is then
+derived from the user's monthly rows, O(months) instead of O(all lines).
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.models import TransactionFingerprint, TransactionLine, User, UserMonthlyAggregate
+from app.utils.file_parser import line_fingerprints
+
+INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Bulk UPDATEs by primary key bypass the session, reload rows it already holds
+FRESH_ROWS = {"populate_existing": True}
+
+# Line columns the aggregates (and fingerprints) are built from
+SEED_COLUMNS = ["date", "amount", "type", "description", "category"]
+
+
+def monthly_totals(lines: Dict[str, list], keep: Iterable[bool]) -> Dict[date, Dict[str, Any]]:
+    """Per-month income/expense/category spend of the kept, dated lines"""
+    months: Dict[date, Dict[str, Any]] = {}
+    for kept, day, amount, kind, category in zip(keep, lines["date"], lines["amount"], lines["type"], lines["category"]):
+        if not kept or day is None:
+            continue
+        month = day.replace(day=1)
+        totals = months.get(month)
+        if totals is None:
+            totals = months[month] = {
+                "income": 0.0, "expense": 0.0, "category_expense": defaultdict(float),
+                "row_count": 0, "first_date": day, "last_date": day,
+            }
+        # Same rules as the statement analysis: missing amounts count as 0
+        amount = amount or 0.0
+        if kind == "CR":
+            totals["income"] += amount
+        elif kind == "DR":
+            totals["expense"] += amount
+            if category is not None:
+                totals["category_expense"][category] += amount
+        totals["row_count"] += 1
+        totals["first_date"] = min(totals["first_date"], day)
+        totals["last_date"] = max(totals["last_date"], day)
+    return months
+
+
+async def _lock_user(db: AsyncSession, user_id):
+    # Serializes aggregate updates of one user (no-op on SQLite, which locks the database).
+    # FOR NO KEY UPDATE, so it does not conflict with the key-share locks the
+    # foreign keys of rows inserted earlier in these transactions already hold
+    await db.execute(select(User.id).where(User.id == user_id).with_for_update(key_share=True))
+
+
+async def record_fingerprints(db: AsyncSession, user_id, transaction_id, fingerprints: List[Optional[str]]) -> Set[str]:
+    """Store fingerprints, returning the ones the user did not have yet"""
+    rows = [
+        {"user_id": user_id, "fingerprint": fingerprint, "transaction_id": transaction_id}
+        for fingerprint in fingerprints if fingerprint is not None
+    ]
+    if not rows:
+        return set()
+    dialect = (await db.connection()).dialect.name
+    stmt = INSERTS[dialect](TransactionFingerprint).on_conflict_do_nothing(
+        index_elements=[TransactionFingerprint.user_id, TransactionFingerprint.fingerprint]
+    ).returning(TransactionFingerprint.fingerprint)
+    result = await db.execute(stmt, rows)
+    return set(result.scalars().all())
+
+
+async def merge_months(db: AsyncSession, user_id, months: Dict[date, Dict[str, Any]]):
+    if not months:
+        return
+    result = await db.execute(
+        select(UserMonthlyAggregate)
+        .where(UserMonthlyAggregate.user_id == user_id, UserMonthlyAggregate.month.in_(list(months))),
+        execution_options=FRESH_ROWS
+    )
+    existing = {row.month: row for row in result.scalars().all()}
+
+    inserts, updates = [], []
+    for month, totals in months.items():
+        row = existing.get(month)
+        if row is None:
+            inserts.append({"user_id": user_id, "month": month, **totals, "category_expense": dict(totals["category_expense"])})
+            continue
+        categories = dict(row.category_expense or {})
+        for category, amount in totals["category_expense"].items():
+            categories[category] = categories.get(category, 0.0) + amount
+        updates.append({
+            "user_id": user_id,
+            "month": month,
+            "income": row.income + totals["income"],
+            "expense": row.expense + totals["expense"],
+            "category_expense": categories,
+            "row_count": row.row_count + totals["row_count"],
+            "first_date": min(d for d in (row.first_date, totals["first_date"]) if d is not None),
+            "last_date": max(d for d in (row.last_date, totals["last_date"]) if d is not None),
+        })
+
+    if inserts:
+        await db.execute(insert(UserMonthlyAggregate), inserts)
+    if updates:
+        # ORM bulk UPDATE by primary key
+        await db.execute(update(UserMonthlyAggregate), updates)
+
+
+async def _apply_lines(db: AsyncSession, user_id, transaction_id, lines: Dict[str, list]) -> List[bool]:
+    """Fold the lines not seen before into the months; True for each such line (and undated ones)"""
+    fingerprints = lines.get("fingerprint") or line_fingerprints(lines)
+    new = await record_fingerprints(db, user_id, transaction_id, fingerprints)
+    # Undated lines cannot be matched, they are always new
+    keep = [fingerprint is None or fingerprint in new for fingerprint in fingerprints]
+    await merge_months(db, user_id, monthly_totals(lines, keep))
+    return keep
+
+
+async def _seed_from_history(db: AsyncSession, user_id, exclude_transaction_id):
+    """First aggregate update for a user with earlier uploads: replay their stored lines once"""
+    has_aggregates = await db.scalar(
+        select(UserMonthlyAggregate.month).where(UserMonthlyAggregate.user_id == user_id).limit(1)
+    )
+    if has_aggregates is not None:
+        return
+
+    transaction_ids = (await db.execute(
+        select(TransactionLine.transaction_id).distinct()
+        .where(TransactionLine.user_id == user_id, TransactionLine.transaction_id != exclude_transaction_id)
+    )).scalars().all()
+
+    # Fingerprint occurrences are counted per statement, so replay one statement at a time
+    for transaction_id in transaction_ids:
+        result = await db.execute(
+            select(*[getattr(TransactionLine, name) for name in SEED_COLUMNS])
+            .where(TransactionLine.transaction_id == transaction_id)
+            .order_by(TransactionLine.line_no)
+        )
+        rows = result.all()
+        lines = {name: [getattr(row, name) for row in rows] for name in SEED_COLUMNS}
+        await _apply_lines(db, user_id, transaction_id, lines)
+
+
+async def rolling_analysis(db: AsyncSession, user_id) -> Dict[str, Any]:
+    """Behaviour analysis over all of the user's months"""
+    from app.ml.behavior_scoring import BehaviorAccumulator
+
+    result = await db.execute(
+        select(UserMonthlyAggregate).where(UserMonthlyAggregate.user_id == user_id),
+        execution_options=FRESH_ROWS
+    )
+    income = expense = 0.0
+    categories: Dict[str, float] = defaultdict(float)
+    first = last = None
+    row_count = 0
+    for month in result.scalars().all():
+        income += month.income
+        expense += month.expense
+        for category, amount in (month.category_expense or {}).items():
+            categories[category] += amount
+        first = month.first_date if first is None else min(first, month.first_date)
+        last = month.last_date if last is None else max(last, month.last_date)
+        row_count += month.row_count
+
+    return BehaviorAccumulator.from_totals(income, expense, categories, first, last, row_count).finalize()
+
+
+async def apply_statement(
+    db: AsyncSession, user_id, transaction_id, lines: Dict[str, list]
+) -> Tuple[List[bool], Dict[str, Any]]:
+    """
+    Fold a saved statement into the user's aggregates. Returns which lines
+    were new to the user (the rest are already stored with an earlier
+    statement) and the resulting behaviour analysis. Runs in the caller's
+    transaction.
+    """
+    await _lock_user(db, user_id)
+    await _seed_from_history(db, user_id, transaction_id)
+    keep = await _apply_lines(db, user_id, transaction_id, lines)
+    return keep, await rolling_analysis(db, user_id)
@@ -0,0 +1,110 @@
+import json
+import logging
+import os
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.schemas.bank import BankResponse
+
+logger = logging.getLogger(__name__)
+
+
+class _BankIndexes:
+    """Immutable snapshot of the catalogue with one sorted view per lookup"""
+
+    def __init__(self, banks: List[Dict[str, Any]], version: float):
+        self.banks = banks
+        self.version = version
+        # Ranking used everywhere: cheapest first, more trusted first on ties
+        self.by_rate = sorted(banks, key=lambda b: (b["interest_rate"], -b["trust_score"]))
+        self.rank = {b["id"]: position for position, b in enumerate(self.by_rate)}
+
+        self.position = {b["id"]: position for position, b in enumerate(banks)}
+        self.by_trust = sorted(banks, key=lambda b: b["trust_score"])
+        self.trust_keys = [b["trust_score"] for b in self.by_trust]
+
+        self.by_max_amount = sorted(banks, key=lambda b: b["max_loan_amount"])
+        self.max_amount_keys = [b["max_loan_amount"] for b in self.by_max_amount]
+
+        self.by_min_score = sorted(banks, key=lambda b: b["min_credit_score"])
+        self.min_score_keys = [b["min_credit_score"] for b in self.by_min_score]
+
+
+class BankCatalogue:
+    """
+    Bank offers loaded from a JSON file into precomputed sorted indexes.
+
+    The file is re-read when its modification time changes (checked at most
+    every `reload_seconds`), so offers can be edited without a restart. A file
+    that fails to load leaves the previous snapshot in place.
+    """
+
+    def __init__(self, path: str, reload_seconds: float = 5):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._indexes = self._load()
+
+    def _load(self) -> _BankIndexes:
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, encoding="utf-8") as f:
+            config = json.load(f)
+        # Validate up front so a bad edit never reaches the endpoints
+        banks = [BankResponse.model_validate(bank).model_dump() for bank in config["banks"]]
+        self._mtime = mtime
+        return _BankIndexes(banks, version=mtime)
+
+    def reload(self):
+        self._indexes = self._load()
+        logger.info("Loaded %s banks from %s", len(self._indexes.banks), self.path)
+
+    def _current(self) -> _BankIndexes:
+        now = time.monotonic()
+        if self.reload_seconds > 0 and now - self._checked_at >= self.reload_seconds:
+            self._checked_at = now
+            try:
+                if os.stat(self.path).st_mtime != self._mtime:
+                    self.reload()
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Keeping previous bank catalogue, reload of %s failed: %s", self.path, e)
+        return self._indexes
+
+    def version(self) -> float:
+        """Changes whenever a new file is loaded"""
+        return self._current().version
+
+    def all(self) -> List[Dict[str, Any]]:
+        return self._current().banks
+
+    def top(self, limit: int = 2) -> List[Dict[str, Any]]:
+        """Lowest interest rates"""
+        return self._current().by_rate[:limit]
+
+    def trusted(self, min_trust: float = 9.5) -> List[Dict[str, Any]]:
+        """Banks with trust_score above `min_trust`, in catalogue order"""
+        indexes = self._current()
+        start = bisect_right(indexes.trust_keys, min_trust)
+        return sorted(indexes.by_trust[start:], key=lambda b: indexes.position[b["id"]])
+
+    def match(self, amount: float, score: float, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Offers that lend at least `amount` to an applicant with credit `score`,
+        ranked like top(). Both conditions are range lookups on sorted keys;
+        only the smaller candidate range is filtered by the other condition.
+        """
+        indexes = self._current()
+        by_amount = indexes.by_max_amount[bisect_left(indexes.max_amount_keys, amount):]
+        by_score = indexes.by_min_score[:bisect_right(indexes.min_score_keys, score)]
+
+        if len(by_amount) <= len(by_score):
+            eligible = [b for b in by_amount if b["min_credit_score"] <= score]
+        else:
+            eligible = [b for b in by_score if b["max_loan_amount"] >= amount]
+
+        eligible.sort(key=lambda b: indexes.rank[b["id"]])
+        return eligible[:limit] if limit else eligible
+
+
+bank_catalogue = BankCatalogue(settings.BANKS_PATH, settings.BANKS_RELOAD_SECONDS)
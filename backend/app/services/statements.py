@@ -0,0 +1,75 @@
+import io
+from typing import Any, Dict, List, Tuple
+import pandas as pd
+from app.ml.behavior_scoring import BehaviorAccumulator
+from app.utils.file_parser import LINE_FIELDS, iter_transaction_batches, line_fingerprints
+
+# Functions here run inside executor workers (possibly other processes), so
+# they only take and return picklable values and raise plain exceptions.
+# This module pulls in pandas and the categorizer; the web process imports it
+# only when a statement is actually processed.
+
+STANDARD_COLUMNS = {"Date", "Description", "Amount", "Type", "Category"}
+
+
+def to_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # NaN is not valid JSON, store null instead
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+
+def _nullable(values: pd.Series) -> list:
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def check_columns(df: pd.DataFrame):
+    required = {'Date', 'Amount', 'Type'} | ({'Description'} if 'Category' not in df.columns else set())
+    missing = required - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(sorted(missing))}")
+
+
+def _append_lines(lines: Dict[str, list], batch: pd.DataFrame, amounts: pd.Series, offset: int):
+    """Append an analysed batch to the columnar line buffers"""
+    lines["line_no"].extend(range(offset, offset + len(batch)))
+    lines["date"].extend(_nullable(batch["Date"].dt.date))
+    lines["description"].extend(_nullable(batch["Description"]) if "Description" in batch else [None] * len(batch))
+    lines["amount"].extend(_nullable(amounts))
+    lines["type"].extend(_nullable(batch["Type"]))
+    lines["category"].extend(_nullable(batch["Category"]))
+
+    extra_columns = [column for column in batch.columns if column not in STANDARD_COLUMNS]
+    if extra_columns:
+        lines["extra"].extend(to_records(batch[extra_columns]))
+    else:
+        lines["extra"].extend([None] * len(batch))
+
+
+def process_statement(filename: str, content: bytes) -> Tuple[Dict[str, list], Dict[str, Any], Dict[str, Any]]:
+    """
+    Parse a statement batch by batch.
+
+    Returns the statement lines (column name -> values, see LINE_FIELDS,
+    plus "fingerprint"), the behaviour analysis and the statement's
+    metadata/aggregates.
+    """
+    lines: Dict[str, list] = {field: [] for field in LINE_FIELDS}
+    accumulator = BehaviorAccumulator()
+
+    for batch in iter_transaction_batches(filename, io.BytesIO(content)):
+        check_columns(batch)
+        # Keep malformed amounts as null in storage, analysis treats them as 0
+        amounts = batch["Amount"].copy()
+        offset = accumulator.row_count
+        accumulator.update(batch)
+        _append_lines(lines, batch, amounts, offset)
+
+    lines["fingerprint"] = line_fingerprints(lines)
+
+    summary = {
+        "row_count": accumulator.row_count,
+        "period_start": accumulator.min_date.date() if accumulator.min_date is not None else None,
+        "period_end": accumulator.max_date.date() if accumulator.max_date is not None else None,
+        "total_income": accumulator.total_income,
+        "total_expense": accumulator.total_expense,
+    }
+    return lines, accumulator.finalize(), summary
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.executor import executor, ExecutorSaturated
+from app.db import crud
+from app.db.models import UploadJob
+from app.db.session import SessionLocal
+from app.services.uploads import save_statement
+
+logger = logging.getLogger(__name__)
+
+
+async def enqueue_upload(db: AsyncSession, user_id, file_name: str, content: bytes, content_hash: Optional[str] = None) -> UploadJob:
+    """
+    Queue an upload. A file the user already sent joins its queued, running
+    or completed job; one that was saved by a synchronous upload gets a
+    completed job pointing at that Transaction. Neither is processed again.
+    """
+    if content_hash:
+        job = await crud.upload_job.get_by_content_hash(db, user_id, content_hash)
+        if job is not None:
+            return job
+        transaction = await crud.transaction.get_by_content_hash(db, user_id, content_hash)
+        if transaction is not None:
+            return await crud.upload_job.create(db, {
+                "user_id": user_id, "file_name": file_name, "content_hash": content_hash,
+                "status": "completed", "progress": 100, "attempts": 0,
+                "transaction_id": transaction.id, "result": transaction.analysis_result,
+            })
+
+    job = await crud.upload_job.create(db, {
+        "user_id": user_id, "file_name": file_name, "payload": content, "content_hash": content_hash,
+        "status": "queued", "progress": 0, "attempts": 0,
+    })
+    upload_job_worker.notify()
+    return job
+
+
+class LeaseLost(Exception):
+    """The job's lease expired and another worker took it over"""
+
+
+def _lease_expiry() -> datetime:
+    return datetime.now(timezone.utc) + timedelta(seconds=settings.UPLOAD_JOB_LEASE_SECONDS)
+
+
+async def claim_next_job(db: AsyncSession) -> Optional[UploadJob]:
+    """
+    Take the oldest queued job, or one whose lease expired (its worker died).
+    FOR UPDATE SKIP LOCKED lets several workers (and app instances) share the
+    table. The job is leased to a new owner id until UPLOAD_JOB_LEASE_SECONDS
+    from now; run_job renews the lease while it works.
+    """
+    while True:
+        result = await db.execute(
+            select(UploadJob)
+            .where(or_(
+                UploadJob.status == "queued",
+                and_(
+                    UploadJob.status == "processing",
+                    or_(UploadJob.lease_expires_at.is_(None), UploadJob.lease_expires_at < datetime.now(timezone.utc)),
+                ),
+            ))
+            .order_by(UploadJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        job = result.scalars().first()
+        if job is None:
+            await db.rollback()
+            return None
+
+        if job.status == "processing" and job.attempts >= settings.UPLOAD_JOB_MAX_ATTEMPTS:
+            # Every attempt so far lost its worker, don't run it again
+            logger.warning("Upload job %s abandoned after %s attempts", job.id, job.attempts)
+            job.status = "failed"
+            job.progress = 0
+            job.payload = None
+            job.error = f"Processing did not finish after {job.attempts} attempts"
+            job.lease_owner = job.lease_expires_at = None
+            await db.commit()
+            continue
+
+        job.status = "processing"
+        job.progress = 10
+        job.attempts += 1
+        job.lease_owner = uuid.uuid4()
+        job.lease_expires_at = _lease_expiry()
+        await db.commit()
+        return job
+
+
+async def _update_leased(db: AsyncSession, job_id, owner, **values) -> bool:
+    """Update the job if `owner` still holds its lease; False once it was taken over"""
+    result = await db.execute(
+        update(UploadJob).where(UploadJob.id == job_id, UploadJob.lease_owner == owner).values(**values)
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def _set_progress(db: AsyncSession, job_id, owner, **values):
+    if not await _update_leased(db, job_id, owner, lease_expires_at=_lease_expiry(), **values):
+        raise LeaseLost(f"Upload job {job_id} was taken over by another worker")
+
+
+async def _heartbeat(session_factory, job_id, owner):
+    # Separate session, the job's own one is busy with the upload
+    while True:
+        await asyncio.sleep(settings.UPLOAD_JOB_LEASE_SECONDS / 3)
+        try:
+            async with session_factory() as db:
+                if not await _update_leased(db, job_id, owner, lease_expires_at=_lease_expiry()):
+                    return
+        except Exception:
+            logger.exception("Could not renew the lease of upload job %s", job_id)
+
+
+async def run_job(db: AsyncSession, job: UploadJob, session_factory=SessionLocal):
+    from app.services.statements import process_statement
+
+    job_id, user_id, file_name, content, attempts = job.id, job.user_id, job.file_name, job.payload, job.attempts
+    content_hash, lease_owner = job.content_hash, job.lease_owner
+    released = {"lease_owner": None, "lease_expires_at": None}
+    heartbeat = asyncio.create_task(_heartbeat(session_factory, job_id, lease_owner))
+    try:
+        # Saved by a synchronous upload (or an earlier holder of this job) since it was queued
+        db_transaction = await crud.transaction.get_by_content_hash(db, user_id, content_hash) if content_hash else None
+        if db_transaction is None:
+            lines, analysis, summary = await executor.run_cpu(process_statement, file_name, content)
+            # Also confirms the lease right before the statement is saved
+            await _set_progress(db, job_id, lease_owner, progress=60)
+            db_transaction = await save_statement(db, user_id, file_name, lines, analysis, summary, content_hash)
+        if not await _update_leased(
+            db, job_id, lease_owner,
+            status="completed", progress=100, payload=None, error=None,
+            transaction_id=db_transaction.id, result=db_transaction.analysis_result, **released,
+        ):
+            raise LeaseLost(f"Upload job {job_id} was taken over by another worker")
+    except LeaseLost as e:
+        # The new holder finishes the job; the content hash keeps it from saving the statement twice
+        await db.rollback()
+        logger.warning("%s", e)
+    except ExecutorSaturated:
+        # Pool is busy serving requests, put the job back for a later pass
+        await db.rollback()
+        await _update_leased(db, job_id, lease_owner, status="queued", progress=0, attempts=attempts - 1, **released)
+        raise
+    except Exception as e:
+        await db.rollback()
+        # Unreadable files (ValueError from the parser) will never succeed, don't retry them
+        if attempts < settings.UPLOAD_JOB_MAX_ATTEMPTS and not isinstance(e, ValueError):
+            logger.warning("Upload job %s failed (attempt %s), retrying: %s", job_id, attempts, e)
+            await _update_leased(db, job_id, lease_owner, status="queued", progress=0, error=str(e), **released)
+        else:
+            logger.warning("Upload job %s failed: %s", job_id, e)
+            await _update_leased(db, job_id, lease_owner, status="failed", progress=0, error=str(e), payload=None, **released)
+    finally:
+        heartbeat.cancel()
+        await asyncio.gather(heartbeat, return_exceptions=True)
+
+
+class UploadJobWorker:
+    """In-process workers that drain the upload_jobs table"""
+
+    def __init__(self, concurrency: int, poll_seconds: float, session_factory=SessionLocal):
+        self.concurrency = concurrency
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def start(self):
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+
+    def notify(self):
+        # Jobs enqueued by this process are picked up without waiting for the next poll
+        self._wakeup.set()
+
+    async def stop(self):
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _wait(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _loop(self):
+        while not self._stopping:
+            try:
+                async with self.session_factory() as db:
+                    job = await claim_next_job(db)
+                    if job is not None:
+                        await run_job(db, job, self.session_factory)
+                        continue
+            except ExecutorSaturated:
+                pass
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Upload job worker error")
+            await self._wait()
+
+
+upload_job_worker = UploadJobWorker(settings.UPLOAD_JOB_WORKERS, settings.UPLOAD_JOB_POLL_SECONDS)
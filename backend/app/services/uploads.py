@@ -0,0 +1,99 @@
+from itertools import compress
+from typing import Any, Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert
+from app.core.response_cache import response_cache
+from app.db import crud
+from app.db.models import Transaction, TransactionLine
+from app.services import aggregates
+from app.utils.file_parser import LINE_FIELDS
+
+# Rows per INSERT when COPY is not available
+LINE_INSERT_BATCH = 5000
+LINE_COLUMNS = ["transaction_id", "user_id"] + LINE_FIELDS
+
+
+async def write_transaction_lines(db: AsyncSession, transaction_id, user_id, lines: Dict[str, list]):
+    """
+    Bulk-write statement lines inside the session's transaction.
+
+    On PostgreSQL (psycopg) rows are streamed with COPY; other databases get
+    multi-row INSERTs.
+    """
+    count = len(lines["line_no"])
+    if not count:
+        return
+
+    columns = [[transaction_id] * count, [user_id] * count] + [lines[field] for field in LINE_FIELDS]
+    conn = await db.connection()
+
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "psycopg":
+        from psycopg.types.json import Jsonb
+
+        extra_index = LINE_COLUMNS.index("extra")
+        columns[extra_index] = [Jsonb(value) if value is not None else None for value in columns[extra_index]]
+
+        raw = await conn.get_raw_connection()
+        async with raw.driver_connection.cursor() as cursor:
+            async with cursor.copy(f"COPY {TransactionLine.__tablename__} ({', '.join(LINE_COLUMNS)}) FROM STDIN") as copy:
+                for row in zip(*columns):
+                    await copy.write_row(row)
+        return
+
+    rows = [dict(zip(LINE_COLUMNS, row)) for row in zip(*columns)]
+    for start in range(0, count, LINE_INSERT_BATCH):
+        await db.execute(insert(TransactionLine), rows[start:start + LINE_INSERT_BATCH])
+
+
+def select_lines(lines: Dict[str, list], keep: List[bool]) -> Dict[str, list]:
+    return {field: list(compress(values, keep)) for field, values in lines.items()}
+
+
+async def save_statement(
+    db: AsyncSession,
+    user_id,
+    file_name: str,
+    lines: Dict[str, list],
+    analysis: Dict[str, Any],
+    summary: Dict[str, Any],
+    content_hash: Optional[str] = None
+) -> Transaction:
+    """
+    Store an analysed statement, fold its new lines into the user's rolling
+    aggregates and refresh the behaviour summary from them. `analysis` (this
+    file only) stays on the Transaction.
+
+    Only lines the user has not uploaded before are stored; the rest already
+    live with an earlier, overlapping statement. If the same file
+    (`content_hash`) was saved concurrently, that Transaction is returned
+    and nothing is written.
+    """
+    # 4. Save Transaction Record (metadata and aggregates only)
+    # Lines reference the transaction, so it is inserted first
+    try:
+        db_transaction = await crud.transaction.create(db, {
+            "user_id": user_id,
+            "file_name": file_name,
+            "analysis_result": analysis,
+            "content_hash": content_hash,
+            **summary
+        }, commit=False)
+    except IntegrityError:
+        await db.rollback()
+        existing = await crud.transaction.get_by_content_hash(db, user_id, content_hash) if content_hash else None
+        if existing is None:
+            raise
+        return existing
+
+    # 5. Update/Create Financial Behavior from all of the user's history (same transaction)
+    keep, behavior = await aggregates.apply_statement(db, user_id, db_transaction.id, lines)
+
+    # 4b. Statement lines not seen before, one row each, indexed by (user_id, date)
+    await write_transaction_lines(db, db_transaction.id, user_id, select_lines(lines, keep))
+    await crud.financial_behavior.upsert(db, user_id, behavior)
+
+    await db.commit()
+    # Cached behaviour summary is stale now
+    await response_cache.invalidate_user(user_id)
+    return db_transaction
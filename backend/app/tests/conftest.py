@@ -0,0 +1,18 @@
+import asyncio
+import os
+import pytest
+
+# Tests must not need a real Supabase project or database
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "test-anon-key")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-jwt-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("APP_ENV", "test")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def dispose_app_engine():
+    """Close the app engine's pooled connections so aiosqlite's worker thread lets the process exit"""
+    yield
+    from app.db.session import engine
+    asyncio.run(engine.dispose())
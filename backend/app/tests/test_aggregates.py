@@ -0,0 +1,124 @@
+import uuid
+from datetime import date
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.models import FinancialBehavior, TransactionFingerprint, User, UserMonthlyAggregate
+from app.db.session import Base
+from app.services.uploads import save_statement
+from app.utils.file_parser import LINE_FIELDS, line_fingerprints
+
+
+def _statement(rows):
+    """rows: (date, description, amount, type, category)"""
+    lines = {field: [] for field in LINE_FIELDS}
+    for i, (day, description, amount, kind, category) in enumerate(rows):
+        lines["line_no"].append(i)
+        lines["date"].append(day)
+        lines["description"].append(description)
+        lines["amount"].append(amount)
+        lines["type"].append(kind)
+        lines["category"].append(category)
+        lines["extra"].append(None)
+    lines["fingerprint"] = line_fingerprints(lines)
+    summary = {"row_count": len(rows), "period_start": None, "period_end": None, "total_income": 0.0, "total_expense": 0.0}
+    return lines, summary
+
+
+def _insert_args(rows):
+    lines, summary = _statement(rows)
+    return lines, ANALYSIS, summary
+
+
+ANALYSIS = {"total_score": 0.0, "behavior_rating": "Bad", "category_scores": {}, "liquidity_resilience_days": 0}
+
+JANUARY = [
+    (date(2024, 1, 1), "Salary credit", 50000.0, "CR", "Income"),
+    (date(2024, 1, 5), "Swiggy food", 400.0, "DR", "Food"),
+    (date(2024, 1, 5), "Swiggy food", 400.0, "DR", "Food"),  # a second, identical order
+]
+FEBRUARY = [
+    (date(2024, 2, 1), "Salary credit", 50000.0, "CR", "Income"),
+    (date(2024, 2, 10), "Uber trip", 300.0, "DR", "Transport"),
+]
+MARCH = [
+    (date(2024, 3, 1), "Salary credit", 52000.0, "CR", "Income"),
+    (date(2024, 3, 3), "Home loan EMI", 20000.0, "DR", "Loan"),
+]
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'aggregates.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _user(Session) -> uuid.UUID:
+    user_id = uuid.uuid4()
+    async with Session() as db:
+        db.add(User(id=user_id, email=f"{user_id}@example.com", full_name="Test", phone="9999999999", city_tier=1))
+        await db.commit()
+    return user_id
+
+
+async def _months(Session, user_id):
+    async with Session() as db:
+        result = await db.execute(
+            select(UserMonthlyAggregate).where(UserMonthlyAggregate.user_id == user_id).order_by(UserMonthlyAggregate.month)
+        )
+        return {row.month: row for row in result.scalars().all()}
+
+
+@pytest.mark.asyncio
+async def test_overlapping_statements_are_counted_once(session_factory):
+    Session = session_factory
+    user_id = await _user(Session)
+
+    async with Session() as db:
+        await save_statement(db, user_id, "jan-feb.csv", *_insert_args(JANUARY + FEBRUARY))
+    async with Session() as db:
+        # Overlaps February, adds March
+        await save_statement(db, user_id, "feb-mar.csv", *_insert_args(FEBRUARY + MARCH))
+
+    months = await _months(Session, user_id)
+    assert list(months) == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+    assert months[date(2024, 1, 1)].expense == 800.0  # both identical orders count
+    assert months[date(2024, 1, 1)].category_expense == {"Food": 800.0}
+    assert months[date(2024, 2, 1)].income == 50000.0
+    assert months[date(2024, 2, 1)].row_count == 2
+    assert months[date(2024, 3, 1)].last_date == date(2024, 3, 3)
+
+    async with Session() as db:
+        behavior = (await db.execute(select(FinancialBehavior).where(FinancialBehavior.user_id == user_id))).scalars().one()
+        fingerprints = await db.scalar(select(func.count()).select_from(TransactionFingerprint))
+
+    assert fingerprints == 7
+    # Derived from all three months, not from the last file
+    assert set(behavior.category_scores) == {"Food", "Transport", "Loan"}
+    assert behavior.total_score == 10.0
+
+
+@pytest.mark.asyncio
+async def test_first_update_seeds_from_stored_lines(session_factory):
+    Session = session_factory
+    user_id = await _user(Session)
+
+    async with Session() as db:
+        await save_statement(db, user_id, "jan.csv", *_insert_args(JANUARY))
+    # Simulate data uploaded before the aggregates existed
+    async with Session() as db:
+        await db.execute(UserMonthlyAggregate.__table__.delete())
+        await db.execute(TransactionFingerprint.__table__.delete())
+        await db.commit()
+
+    async with Session() as db:
+        await save_statement(db, user_id, "jan-feb.csv", *_insert_args(JANUARY + FEBRUARY))
+
+    months = await _months(Session, user_id)
+    assert months[date(2024, 1, 1)].expense == 800.0
+    assert months[date(2024, 2, 1)].expense == 300.0
@@ -11,11 +11,13 @@ async def client():
 @pytest.mark.asyncio
 async def test_health_check(client):
     """Test the health check endpoint"""
-    response = await client.get("/health")
-    # Health endpoint might return 200 or 503 depending on DB, but for now we expect 200
-    # based on verify_backend.py output
+    response = await client.get("/api/health")
+    # Readiness check against the test database (in-memory SQLite)
     assert response.status_code == 200
-    assert response.json() == {"status": "ok"}
+    body = response.json()
+    assert body["status"] == "ok"
+    assert body["database"]["ok"] is True
+    assert body["auth"]["circuit"] == "closed"
 
 @pytest.mark.asyncio
 async def test_openapi_docs(client):
@@ -0,0 +1,110 @@
+import asyncio
+import httpx
+import pytest
+from app.core.auth_gateway import AuthGatewayUnavailable, AuthRejected, CircuitBreaker, SupabaseAuthGateway
+
+
+def _gateway(handler, retries=2, failures=3, reset_seconds=60):
+    return SupabaseAuthGateway(
+        "https://project.supabase.co", "anon-key",
+        timeout=1, connect_timeout=1, retries=retries, max_connections=5,
+        breaker=CircuitBreaker(failures, reset_seconds),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"id": "user-1", "email": "a@example.com"})
+
+    gateway = _gateway(handler)
+    user = await gateway.get_user("token")
+
+    assert user["id"] == "user-1"
+    assert len(calls) == 3
+    assert calls[-1].headers["apikey"] == "anon-key"
+    assert calls[-1].headers["authorization"] == "Bearer token"
+    assert gateway.breaker.state == "closed"
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_rejection_is_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400, json={"error_description": "Invalid login credentials"})
+
+    gateway = _gateway(handler)
+    with pytest.raises(AuthRejected, match="Invalid login credentials"):
+        await gateway.sign_in_with_password("a@example.com", "wrong")
+
+    assert len(calls) == 1
+    assert gateway.breaker.failures == 0
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_recovers():
+    state = {"calls": 0, "healthy": False}
+
+    def handler(request):
+        state["calls"] += 1
+        if not state["healthy"]:
+            raise httpx.ConnectTimeout("timed out")
+        return httpx.Response(204)
+
+    gateway = _gateway(handler, retries=0, failures=2)
+    for _ in range(2):
+        with pytest.raises(AuthGatewayUnavailable):
+            await gateway.sign_out("token")
+    assert gateway.breaker.state == "open"
+
+    # Open circuit fails fast without touching the provider
+    with pytest.raises(AuthGatewayUnavailable):
+        await gateway.sign_out("token")
+    assert state["calls"] == 2
+
+    state["healthy"] = True
+    gateway.breaker.reset_seconds = 0
+    await gateway.sign_out("token")
+    assert gateway.breaker.state == "closed"
+    await gateway.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_does_not_keep_circuit_open():
+    state = {"calls": 0, "hang": True}
+    started = asyncio.Event()
+
+    async def handler(request):
+        state["calls"] += 1
+        if state["hang"]:
+            started.set()
+            await asyncio.sleep(60)
+        return httpx.Response(204)
+
+    gateway = _gateway(handler, retries=0, failures=1, reset_seconds=0)
+    gateway.breaker.record_failure()
+    assert gateway.breaker.state == "half-open"
+
+    # The trial request is cancelled (e.g. the client disconnected)
+    trial = asyncio.ensure_future(gateway.sign_out("token"))
+    await started.wait()
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+
+    # The next call becomes the trial instead of being rejected forever
+    state["hang"] = False
+    await gateway.sign_out("token")
+    assert gateway.breaker.state == "closed"
+    assert state["calls"] == 2
+    await gateway.close()
@@ -0,0 +1,66 @@
+import json
+import os
+import pytest
+from app.core.config import settings
+from app.services.bank_catalogue import BankCatalogue
+
+
+def _bank(id, rate, max_amount, min_score, trust):
+    return {
+        "id": id, "name": f"Bank {id}", "interest_rate": rate, "max_loan_amount": max_amount,
+        "min_credit_score": min_score, "trust_score": trust,
+    }
+
+
+@pytest.fixture
+def catalogue_file(tmp_path):
+    path = tmp_path / "banks.json"
+    path.write_text(json.dumps({"banks": [
+        _bank(1, 10.5, 1_500_000, 750, 9.8),
+        _bank(2, 9.8, 2_000_000, 700, 9.9),
+        _bank(3, 11.0, 1_000_000, 700, 9.2),
+        _bank(4, 14.0, 500_000, 650, 8.5),
+    ]}))
+    return path
+
+
+def test_match_filters_and_ranks(catalogue_file):
+    catalogue = BankCatalogue(str(catalogue_file), reload_seconds=0)
+
+    assert [b["id"] for b in catalogue.match(800_000, 720)] == [2, 3]
+    assert [b["id"] for b in catalogue.match(400_000, 800)] == [2, 1, 3, 4]
+    assert catalogue.match(3_000_000, 900) == []
+    assert [b["id"] for b in catalogue.match(400_000, 800, limit=1)] == [2]
+
+
+def test_match_agrees_with_linear_scan():
+    catalogue = BankCatalogue(settings.BANKS_PATH, reload_seconds=0)
+    for amount in [100_000, 500_000, 800_000, 1_200_000, 1_500_001, 2_000_000]:
+        for score in [600, 650, 700, 720, 750, 900]:
+            expected = sorted(
+                (b for b in catalogue.all() if b["max_loan_amount"] >= amount and b["min_credit_score"] <= score),
+                key=lambda b: (b["interest_rate"], -b["trust_score"])
+            )
+            assert catalogue.match(amount, score) == expected
+
+
+def test_top_and_trusted(catalogue_file):
+    catalogue = BankCatalogue(str(catalogue_file), reload_seconds=0)
+    assert [b["id"] for b in catalogue.top(2)] == [2, 1]
+    # Catalogue order, as before the indexes existed
+    assert [b["id"] for b in catalogue.trusted(9.5)] == [1, 2]
+    assert [b["id"] for b in catalogue.trusted(9.0)] == [1, 2, 3]
+
+
+def test_hot_reload_keeps_last_good_snapshot(catalogue_file):
+    catalogue = BankCatalogue(str(catalogue_file), reload_seconds=0.001)
+
+    catalogue_file.write_text(json.dumps({"banks": [_bank(9, 8.0, 5_000_000, 600, 9.9)]}))
+    os.utime(catalogue_file, (1, 1))
+    catalogue._checked_at = 0
+    assert [b["id"] for b in catalogue.all()] == [9]
+
+    catalogue_file.write_text("{not json")
+    os.utime(catalogue_file, (2, 2))
+    catalogue._checked_at = 0
+    assert [b["id"] for b in catalogue.all()] == [9]
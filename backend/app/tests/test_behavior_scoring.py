@@ -0,0 +1,88 @@
+import pandas as pd
+import pytest
+from app.ml.behavior_scoring import analyze_behavior, BehaviorAccumulator
+
+def make_statement():
+    return pd.DataFrame({
+        "Date": ["2024-01-01", "2024-01-05", "2024-01-10", "2024-01-15", "2024-02-01", "2024-02-20"],
+        "Description": ["Salary January", "Grocery store", "Home loan EMI", "Stock invest", "Salary February", "Uber ride"],
+        "Amount": ["60000", "4000", "15000", "10000", "60000", "800"],
+        "Type": ["CR", "DR", "DR", "DR", "CR", "DR"],
+    })
+
+def test_analyze_behavior_scores_statement():
+    result = analyze_behavior(make_statement())
+    assert result["behavior_rating"] == "Good"
+    assert set(result["category_scores"]) == {"Food", "Loan", "Investments", "Transport"}
+    assert result["stable_inflow"]
+
+def test_chunked_updates_match_full_analysis():
+    full = analyze_behavior(make_statement())
+
+    statement = make_statement()
+    accumulator = BehaviorAccumulator()
+    for start in range(0, len(statement), 2):
+        accumulator.update(statement.iloc[start:start + 2].copy())
+
+    assert accumulator.finalize() == full
+
+def test_chunked_fractional_amounts_match_full_analysis():
+    rows = 997
+    statement = pd.DataFrame({
+        "Date": pd.date_range("2024-01-01", periods=rows, freq="7h").strftime("%Y-%m-%d"),
+        "Description": ["Salary credit", "Swiggy food", "Home loan EMI", "Stock invest", "Uber ride"] * 199 + ["Coffee"] * 2,
+        "Amount": [f"{(i * 37.13) % 991 + 0.07:.2f}" for i in range(rows)],
+        "Type": (["CR"] + ["DR"] * 4) * 199 + ["DR", "DR"],
+    })
+    full = analyze_behavior(statement.copy())
+
+    accumulator = BehaviorAccumulator()
+    for start in range(0, rows, 100):
+        accumulator.update(statement.iloc[start:start + 100].copy())
+    chunked = accumulator.finalize()
+
+    # Sums taken in a different order differ in the last bits only
+    assert accumulator.total_income == pytest.approx(statement["Amount"].astype(float)[statement["Type"] == "CR"].sum())
+    assert chunked["category_scores"] == pytest.approx(full["category_scores"])
+    assert chunked["total_score"] == full["total_score"]
+    assert chunked["liquidity_resilience_days"] == pytest.approx(full["liquidity_resilience_days"], abs=1)
+    assert chunked["behavior_rating"] == full["behavior_rating"]
+
+def test_merged_workers_match_full_analysis():
+    full = analyze_behavior(make_statement())
+
+    statement = make_statement()
+    first = BehaviorAccumulator().update(statement.iloc[:3].copy())
+    second = BehaviorAccumulator().update(statement.iloc[3:].copy())
+
+    assert first.merge(second).finalize() == full
+    assert first.row_count == len(statement)
+
+def test_categorizer_keeps_rule_priority():
+    from app.ml.categorizer import KeywordCategorizer
+
+    categorizer = KeywordCategorizer([
+        {"category": "Income", "keywords": ["salary"]},
+        {"category": "Loan", "keywords": ["loan"]},
+    ])
+    descriptions = pd.Series(["SALARY LOAN ADJ", "Loan EMI", "Coffee", None] * 1000)
+    expected = [categorizer.categorize(d) for d in descriptions]
+
+    assert categorizer.categorize_series(descriptions).tolist() == expected
+    assert expected[:4] == ["Income", "Loan", "Others", "Others"]
+
+def test_categorizer_rejects_malformed_rules():
+    from app.ml.categorizer import KeywordCategorizer
+
+    with pytest.raises(ValueError, match="keywords"):
+        KeywordCategorizer([{"category": "Income", "keywords": ["salary", 42]}])
+    with pytest.raises(ValueError, match="category"):
+        KeywordCategorizer([{"keywords": ["salary"]}])
+
+def test_categorizer_matches_keywords_literally():
+    from app.ml.categorizer import KeywordCategorizer
+
+    categorizer = KeywordCategorizer([{"category": "Fees", "keywords": ["a.t.m (fee)"]}])
+    descriptions = pd.Series(["A.T.M (FEE) 12", "ATM FEE"])
+
+    assert categorizer.categorize_series(descriptions).tolist() == ["Fees", "Others"]
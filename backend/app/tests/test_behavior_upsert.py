@@ -0,0 +1,62 @@
+import asyncio
+import os
+import uuid
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db.models import FinancialBehavior, Transaction, User
+from app.db.session import Base
+from app.services.uploads import save_statement
+
+PARALLEL_UPLOADS = 8
+
+# Set TEST_POSTGRES_URL (postgresql+psycopg://...) to also run against PostgreSQL
+DATABASE_URLS = ["sqlite"] + ([os.environ["TEST_POSTGRES_URL"]] if os.environ.get("TEST_POSTGRES_URL") else [])
+
+
+def _analysis(score: float) -> dict:
+    return {
+        "total_score": score,
+        "behavior_rating": "good",
+        "category_scores": {"Food": score},
+        "liquidity_resilience_days": 30,
+    }
+
+
+def _statement() -> tuple:
+    lines = {field: [] for field in ["line_no", "date", "description", "amount", "type", "category", "extra"]}
+    summary = {"row_count": 0, "period_start": None, "period_end": None, "total_income": 0.0, "total_expense": 0.0}
+    return lines, summary
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("url", DATABASE_URLS)
+async def test_parallel_uploads_keep_one_behavior_row(tmp_path, url):
+    if url == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'upsert.db'}"
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = sessionmaker(bind=engine, class_=AsyncSession)
+
+    user_id = uuid.uuid4()
+    async with Session() as db:
+        db.add(User(id=user_id, email=f"{user_id}@example.com", full_name="Test", phone="9999999999", city_tier=1))
+        await db.commit()
+
+    async def upload(score: float):
+        lines, summary = _statement()
+        async with Session() as db:
+            await save_statement(db, user_id, f"statement-{score}.csv", lines, _analysis(score), summary)
+
+    await asyncio.gather(*(upload(float(i)) for i in range(PARALLEL_UPLOADS)))
+
+    async with Session() as db:
+        behaviors = (await db.execute(select(FinancialBehavior).where(FinancialBehavior.user_id == user_id))).scalars().all()
+        uploads = await db.scalar(select(func.count()).select_from(Transaction).where(Transaction.user_id == user_id))
+
+    assert uploads == PARALLEL_UPLOADS
+    assert len(behaviors) == 1
+    assert behaviors[0].total_score in {float(i) for i in range(PARALLEL_UPLOADS)}
+    await engine.dispose()
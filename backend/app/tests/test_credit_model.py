@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+from app.ml.credit_model import CreditScoringModel
+
+APPLICANTS = [
+    [600000, 1500000, 200000, 2, 15000, 500000],
+    [120000, 0, 900000, 9, 90000, 1000000],
+    [5000000, 9000000, 0, 0, 0, 5000],  # outside the bounds, exercises clipping
+]
+
+def test_predict_batch_matches_predict():
+    model = CreditScoringModel()
+    batch = model.predict_batch(np.array(APPLICANTS))
+    singles = [model.predict(applicant) for applicant in APPLICANTS]
+    assert batch.tolist() == singles
+
+def test_predict_batch_accepts_dataframe():
+    model = CreditScoringModel()
+    frame = pd.DataFrame(APPLICANTS, columns=[
+        "annual_income", "total_assets", "total_debt_amount",
+        "num_debts", "monthly_emis", "amount_requested",
+    ])
+    frame["monthly_income"] = frame.pop("annual_income") / 12
+    assert np.allclose(model.predict_batch(frame), model.predict_batch(np.array(APPLICANTS)))
+
+def test_scores_are_probabilities():
+    scores = CreditScoringModel().predict_batch(np.array(APPLICANTS))
+    assert ((scores > 0) & (scores < 1)).all()
@@ -0,0 +1,38 @@
+import uuid
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.db import crud
+from app.db.session import Base, SessionLocal
+
+
+@pytest.mark.asyncio
+async def test_create_returns_server_defaults_without_reload():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute", lambda conn, cursor, stmt, *args: statements.append(stmt))
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with Session() as db:
+        user = await crud.user.create(db, {
+            "id": uuid.uuid4(), "email": "a@example.com", "full_name": "A", "phone": "9999999999", "city_tier": 1,
+        })
+        loan = await crud.loan.create(db, {
+            "user_id": user.id, "amount_requested": 1000.0, "num_debts": 0, "total_debt_amount": 0.0,
+            "monthly_emis": 0.0, "total_assets": 0.0, "monthly_income": 100.0,
+        })
+
+    # Python and server defaults come back from the INSERT itself
+    assert loan.id is not None
+    assert loan.status == "pending"
+    assert loan.created_at is not None
+    assert user.created_at is not None
+    assert not [stmt for stmt in statements if stmt.lstrip().upper().startswith("SELECT")]
+    await engine.dispose()
+
+
+def test_sessions_keep_objects_loaded_after_commit():
+    assert SessionLocal.kw["expire_on_commit"] is False
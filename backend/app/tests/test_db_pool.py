@@ -0,0 +1,16 @@
+from app.core.config import DB_PROFILES
+from app.db.pool import InstrumentedQueuePool
+from app.db.session import build_engine_kwargs
+
+
+def test_production_profile_uses_instrumented_pool():
+    kwargs = build_engine_kwargs("postgresql+psycopg://db/app", dict(DB_PROFILES["production"]))
+    assert kwargs["poolclass"] is InstrumentedQueuePool
+    assert kwargs["echo"] is False
+    assert kwargs["pool_pre_ping"] is True
+    assert "statement_timeout" in kwargs["connect_args"]["options"]
+
+
+def test_sqlite_keeps_default_pool():
+    kwargs = build_engine_kwargs("sqlite+aiosqlite://", dict(DB_PROFILES["test"]))
+    assert kwargs == {"echo": False}
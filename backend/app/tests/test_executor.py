@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+import pytest
+from app.core.executor import TaskExecutor, ExecutorSaturated
+from app.services.statements import process_statement
+
+CSV = b"Date,Description,Amount,Type\n2024-01-01,Salary,50000,CR\n2024-01-20,Grocery,2000,DR\n"
+
+def _crash():
+    os._exit(1)
+
+@pytest.mark.asyncio
+async def test_cpu_work_runs_in_process_pool():
+    executor = TaskExecutor(io_workers=1, cpu_workers=1, max_pending=4, max_per_owner=4, cpu_mode="process")
+    try:
+        lines, analysis, summary = await executor.run_cpu(process_statement, "statement.csv", CSV)
+    finally:
+        executor.shutdown()
+
+    assert len(lines["line_no"]) == summary["row_count"] == 2
+    assert analysis["behavior_rating"] == "Good"
+    assert executor.stats()["tasks"]["cpu:process_statement"]["count"] == 1
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_with_503():
+    executor = TaskExecutor(io_workers=1, cpu_workers=1, max_pending=1, max_per_owner=4, cpu_mode="thread")
+    try:
+        running = asyncio.ensure_future(executor.run_io(time.sleep, 0.2))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated) as rejected:
+            await executor.run_io(time.sleep, 0)
+        await running
+    finally:
+        executor.shutdown()
+
+    assert rejected.value.status_code == 503
+    assert executor.stats()["rejected"]["io"] == 1
+
+@pytest.mark.asyncio
+async def test_busy_owner_rejects_with_429():
+    executor = TaskExecutor(io_workers=2, cpu_workers=1, max_pending=4, max_per_owner=1, cpu_mode="thread")
+    try:
+        running = asyncio.ensure_future(executor.run_io(time.sleep, 0.2, owner="user-1"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorSaturated) as rejected:
+            await executor.run_io(time.sleep, 0, owner="user-1")
+        # Other users are still admitted
+        await executor.run_io(time.sleep, 0, owner="user-2")
+        await running
+    finally:
+        executor.shutdown()
+
+    assert rejected.value.status_code == 429
+
+@pytest.mark.asyncio
+async def test_broken_process_pool_is_replaced():
+    executor = TaskExecutor(io_workers=1, cpu_workers=1, max_pending=4, max_per_owner=4, cpu_mode="process")
+    try:
+        # A worker that dies (e.g. OOM-killed) breaks the whole pool
+        with pytest.raises(ExecutorSaturated) as rejected:
+            await executor.run_cpu(_crash)
+        lines, _, _ = await executor.run_cpu(process_statement, "statement.csv", CSV)
+    finally:
+        executor.shutdown()
+
+    assert rejected.value.status_code == 503
+    assert len(lines["line_no"]) == 2
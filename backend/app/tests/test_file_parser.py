@@ -0,0 +1,44 @@
+import hashlib
+import io
+import pytest
+from openpyxl import Workbook
+from app.utils.file_parser import iter_transaction_batches, read_upload, FileTooLargeError
+
+CSV = (
+    "Date,Description,Amount,Type\n"
+    "2024-01-01,Salary,50000,CR\n"
+    "2024-01-02,Grocery store,1200.50,DR\n"
+    "2024-01-03,Uber,not-a-number,DR\n"
+)
+
+def test_csv_is_read_in_typed_batches():
+    batches = list(iter_transaction_batches("statement.csv", io.BytesIO(CSV.encode()), chunk_rows=2))
+    assert [len(batch) for batch in batches] == [2, 1]
+    assert all(batch["Amount"].dtype == "float64" for batch in batches)
+    assert batches[0]["Description"].tolist() == ["Salary", "Grocery store"]
+    assert batches[1]["Amount"].isna().all()
+
+def test_csv_size_limit_is_enforced_while_reading():
+    big = io.BytesIO(CSV.encode() * 200000)
+    with pytest.raises(FileTooLargeError):
+        list(iter_transaction_batches("statement.csv", big, chunk_rows=100, limit_mb=1))
+
+def test_xlsx_is_streamed_in_read_only_mode():
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["Date", "Description", "Amount", "Type"])
+    for day in range(1, 6):
+        sheet.append([f"2024-01-0{day}", "Fuel", 100 * day, "DR"])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    buffer.seek(0)
+
+    batches = list(iter_transaction_batches("statement.xlsx", buffer, chunk_rows=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert sum(batch["Amount"].sum() for batch in batches) == 1500
+    assert batches[0]["Date"].iloc[0] == "2024-01-01"
+
+def test_read_upload_hashes_content():
+    content, content_hash = read_upload(io.BytesIO(CSV.encode()), limit_mb=1)
+    assert content == CSV.encode()
+    assert content_hash == hashlib.sha256(CSV.encode()).hexdigest()
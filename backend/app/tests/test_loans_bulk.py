@@ -0,0 +1,113 @@
+import json
+import uuid
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.api import loans
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.core.executor import ExecutorSaturated
+from app.db.models import LoanApplication, User
+from app.db.session import Base, get_db
+from app.main import app
+
+APPLICATION = {
+    "amount_requested": 250000.0, "num_debts": 1, "total_debt_amount": 40000.0,
+    "monthly_emis": 3500.0, "total_assets": 600000.0, "monthly_income": 65000.0,
+}
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'loans.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    user = User(id=uuid.uuid4(), email="bulk@example.com", full_name="Test", phone="9999999999", city_tier=1)
+    async with Session() as db:
+        db.add(user)
+        await db.commit()
+
+    async def session():
+        async with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        ac.Session = Session
+        yield ac
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+async def _stored(Session) -> int:
+    async with Session() as db:
+        return await db.scalar(select(func.count()).select_from(LoanApplication))
+
+
+@pytest.mark.asyncio
+async def test_json_array_reports_every_row(client):
+    rows = [APPLICATION, {**APPLICATION, "monthly_income": "n/a"}, APPLICATION]
+    response = await client.post("/api/loans/apply/bulk", json=rows)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"], body["truncated"]) == (2, 1, False)
+    assert [row["status"] for row in body["results"]] == ["created", "invalid", "created"]
+    assert body["results"][1]["error"].startswith("monthly_income")
+    assert body["results"][0]["loan"]["ml_score"] is not None
+    assert await _stored(client.Session) == 2
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_caps_line_size(client, monkeypatch):
+    monkeypatch.setattr(settings, "LOAN_BULK_MAX_LINE_BYTES", 1024)
+    oversized = json.dumps({**APPLICATION, "padding": "x" * 5000})
+    body = "\n".join([json.dumps(APPLICATION), oversized, "not json", json.dumps(APPLICATION)]) + "\n"
+
+    response = await client.post("/api/loans/apply/bulk", content=body.encode(), headers=NDJSON)
+
+    results = response.json()["results"]
+    assert [row["status"] for row in results] == ["created", "invalid", "invalid", "created"]
+    assert "exceeds 1024 bytes" in results[1]["error"]
+    assert await _stored(client.Session) == 2
+
+
+@pytest.mark.asyncio
+async def test_saturated_chunk_is_reported_after_stored_chunks(client, monkeypatch):
+    monkeypatch.setattr(settings, "LOAN_BULK_CHUNK_SIZE", 2)
+    score = loans._score
+    calls = []
+
+    async def saturated_after_first_chunk(applications, owner=None):
+        calls.append(len(applications))
+        if len(calls) > 1:
+            raise ExecutorSaturated("Server is busy, please retry shortly")
+        return await score(applications, owner)
+
+    monkeypatch.setattr(loans, "_score", saturated_after_first_chunk)
+    response = await client.post("/api/loans/apply/bulk", json=[APPLICATION] * 3)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["status"] for row in body["results"]] == ["created", "created", "failed"]
+    assert body["results"][2]["error"] == "Server is busy, please retry shortly"
+    assert await _stored(client.Session) == 2
+
+
+@pytest.mark.asyncio
+async def test_score_batch_size_is_limited_by_the_schema(client):
+    ok = await client.post("/api/loans/score-batch", json={"applications": [APPLICATION] * 2})
+    assert ok.status_code == 200
+    assert len(ok.json()["scores"]) == 2
+
+    too_many = [APPLICATION] * (settings.SCORE_BATCH_MAX_SIZE + 1)
+    rejected = await client.post("/api/loans/score-batch", json={"applications": too_many})
+    assert rejected.status_code == 422
+    assert rejected.json()["detail"][0]["type"] == "too_long"
@@ -0,0 +1,68 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry, RequestStats, _request_stats
+from app.db.session import engine
+from app.main import app
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+    latency.observe(0.05, route="/a")
+    latency.observe(0.5, route="/a")
+    latency.observe(5, route="/a")
+
+    lines = registry.render().splitlines()
+    assert "# TYPE latency_seconds histogram" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits_total", "Hits", ["path"])
+    counter.inc(path='a"b\\c')
+    assert 'hits_total{path="a\\"b\\\\c"} 1' in registry.render()
+
+
+@pytest.mark.asyncio
+async def test_queries_are_counted_for_the_current_request():
+    stats = RequestStats()
+    token = _request_stats.set(stats)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT 2"))
+    finally:
+        _request_stats.reset(token)
+    assert stats.db_queries == 2
+    assert stats.db_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_route_templates(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        await client.get("/api/health")
+        await client.get("/api/loans/some-id")
+        response = await client.get("/api/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/health",status="200"}' in body
+    # Path parameters are not labels, the template is
+    assert 'route="/api/loans/{loan_id}"' in body
+    assert 'http_request_db_queries_bucket{route="/api/health",le="1"}' in body
+    assert "executor_pending_tasks" in body
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_is_off_by_default():
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/metrics")
+    assert response.status_code == 404
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import pytest
+from app.utils.pagination import encode_cursor, decode_cursor, next_cursor, InvalidCursorError
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 0, 123456, tzinfo=timezone.utc)
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+
+
+def test_invalid_cursor():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+def test_next_cursor_only_when_more_rows():
+    rows = [SimpleNamespace(created_at=datetime(2024, 1, i + 1), id=uuid.uuid4()) for i in range(3)]
+
+    page, cursor = next_cursor(rows, 3)
+    assert page == rows and cursor is None
+
+    page, cursor = next_cursor(rows, 2)
+    assert page == rows[:2]
+    assert decode_cursor(cursor) == (rows[1].created_at, rows[1].id)
@@ -0,0 +1,63 @@
+import os
+import uuid
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, select
+from app.db.models import LoanApplication, Transaction, TransactionLine, FinancialBehavior, UploadJob
+from datetime import datetime, timezone
+from app.utils.pagination import keyset_page, encode_cursor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="module")
+def connection():
+    """SQLite database built by the Alembic migrations"""
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+        config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+        config.attributes["connection"] = conn
+        command.upgrade(config, "head")
+        conn.commit()
+        yield conn
+
+
+def query_plan(conn, query) -> str:
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled)).all()
+    return "\n".join(row[-1] for row in rows)
+
+
+USER_ID = uuid.uuid4()
+
+HOT_QUERIES = {
+    "ix_loan_applications_user_id_created_at_id": keyset_page(
+        select(LoanApplication).where(LoanApplication.user_id == USER_ID), LoanApplication, None, 50
+    ),
+    "ix_transactions_user_id_created_at_id": keyset_page(
+        select(Transaction).where(Transaction.user_id == USER_ID), Transaction, None, 50
+    ),
+    "uq_financial_behavior_user_id": select(FinancialBehavior).where(FinancialBehavior.user_id == USER_ID),
+    "ix_transaction_lines_user_id_date": select(TransactionLine).where(
+        TransactionLine.user_id == USER_ID, TransactionLine.date >= "2024-01-01"
+    ),
+    "ix_upload_jobs_status_created_at": select(UploadJob).where(UploadJob.status == "queued").order_by(UploadJob.created_at).limit(1),
+}
+
+
+@pytest.mark.parametrize("index_name", sorted(HOT_QUERIES))
+def test_hot_queries_use_index(connection, index_name):
+    plan = query_plan(connection, HOT_QUERIES[index_name])
+    assert index_name in plan, plan
+    # Ordering must come from the index, not a sort of every matching row
+    assert "TEMP B-TREE" not in plan, plan
+
+
+def test_keyset_page_after_cursor_uses_index(connection):
+    cursor = encode_cursor(datetime(2024, 1, 1, tzinfo=timezone.utc), uuid.uuid4())
+    page = keyset_page(select(Transaction).where(Transaction.user_id == USER_ID), Transaction, cursor, 50)
+    plan = query_plan(connection, page)
+    assert "ix_transactions_user_id_created_at_id" in plan, plan
+    assert "TEMP B-TREE" not in plan, plan
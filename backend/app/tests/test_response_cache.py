@@ -0,0 +1,83 @@
+import pytest
+from fastapi import FastAPI, Request
+from httpx import AsyncClient
+from pydantic import BaseModel
+from app.core.response_cache import CacheBackend, InMemoryCacheBackend, ResponseCache
+
+
+class Item(BaseModel):
+    value: int
+
+
+def _app(cache: ResponseCache, state: dict) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{user_id}")
+    async def item(user_id: str, request: Request):
+        def build():
+            state["builds"] += 1
+            return {"value": state["value"]}
+        return await cache.respond(request, build, Item, ttl=60, user_id=user_id)
+
+    @app.get("/public")
+    async def public(request: Request):
+        return await cache.respond(request, lambda: {"value": state["value"]}, Item, ttl=60)
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_etag_304_and_user_invalidation():
+    cache = ResponseCache(InMemoryCacheBackend(100))
+    state = {"builds": 0, "value": 1}
+
+    async with AsyncClient(app=_app(cache, state), base_url="http://test") as client:
+        first = await client.get("/items/a")
+        assert first.json() == {"value": 1}
+        etag = first.headers["etag"]
+
+        second = await client.get("/items/a", headers={"If-None-Match": etag})
+        assert second.status_code == 304
+        assert second.content == b""
+        assert state["builds"] == 1
+
+        # Other users never share an entry
+        await client.get("/items/b")
+        assert state["builds"] == 2
+
+        state["value"] = 2
+        await cache.invalidate_user("a")
+        third = await client.get("/items/a", headers={"If-None-Match": etag})
+        assert third.status_code == 200
+        assert third.json() == {"value": 2}
+        assert third.headers["etag"] != etag
+        assert state["builds"] == 3
+
+
+@pytest.mark.asyncio
+async def test_entries_expire():
+    backend = InMemoryCacheBackend(100)
+    await backend.set("key", ('"etag"', b"{}"), ttl=-1)
+    assert await backend.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_public_responses_are_revalidated():
+    cache = ResponseCache(InMemoryCacheBackend(100))
+    state = {"builds": 0, "value": 1}
+
+    async with AsyncClient(app=_app(cache, state), base_url="http://test") as client:
+        response = await client.get("/public")
+
+    # Shared caches may store it, but must check the ETag before reuse
+    assert response.headers["cache-control"] == "public, no-cache"
+    assert response.headers["etag"]
+
+
+def test_backends_must_implement_every_method():
+    class Partial(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Partial()
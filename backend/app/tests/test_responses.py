@@ -0,0 +1,44 @@
+import json
+import uuid
+from datetime import date
+import numpy as np
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.responses import FastJSONResponse, prevalidated
+from app.schemas.loan import LoanScore
+
+
+def test_fast_json_response_encodes_native_types():
+    row_id = uuid.uuid4()
+    body = FastJSONResponse({
+        "id": row_id,
+        "day": date(2024, 1, 31),
+        "score": np.float64(0.5),
+        "counts": np.array([1, 2]),
+        "model": LoanScore(ml_score=0.5, acceptance_rate=50.0, status="pending"),
+    }).body
+
+    assert json.loads(body) == {
+        "id": str(row_id),
+        "day": "2024-01-31",
+        "score": 0.5,
+        "counts": [1, 2],
+        "model": {"ml_score": 0.5, "acceptance_rate": 50.0, "status": "pending"},
+    }
+
+
+def test_prevalidated_respects_std_response_class(monkeypatch):
+    monkeypatch.setattr(settings, "JSON_RESPONSE_CLASS", "std")
+    row_id = uuid.uuid4()
+    response = prevalidated({"id": row_id, "model": LoanScore(ml_score=0.5, acceptance_rate=50.0, status="pending")})
+
+    assert type(response) is JSONResponse
+    assert json.loads(response.body) == {
+        "id": str(row_id),
+        "model": {"ml_score": 0.5, "acceptance_rate": 50.0, "status": "pending"},
+    }
+
+
+def test_prevalidated_uses_orjson_by_default(monkeypatch):
+    monkeypatch.setattr(settings, "JSON_RESPONSE_CLASS", "orjson")
+    assert isinstance(prevalidated({"a": 1}), FastJSONResponse)
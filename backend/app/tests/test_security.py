@@ -0,0 +1,47 @@
+import time
+import pytest
+from jose import jwt
+from app.core.security import SupabaseTokenVerifier, TokenVerificationError
+
+SECRET = "test-jwt-secret"
+
+def make_token(secret=SECRET, **overrides):
+    claims = {
+        "sub": "7f3b1c2e-0000-4000-8000-000000000001",
+        "email": "user@example.com",
+        "aud": "authenticated",
+        "exp": int(time.time()) + 3600,
+        "user_metadata": {"full_name": "Test User"},
+    }
+    claims.update(overrides)
+    return jwt.encode(claims, secret, algorithm="HS256")
+
+@pytest.fixture
+def verifier():
+    verifier = SupabaseTokenVerifier()
+    verifier.mode = "local"
+    verifier.secret = SECRET
+    verifier.remote_fallback = False
+    return verifier
+
+@pytest.mark.asyncio
+async def test_local_verification_returns_claims(verifier):
+    payload = await verifier.verify(make_token())
+    assert payload.email == "user@example.com"
+    assert payload.user_metadata["full_name"] == "Test User"
+
+@pytest.mark.asyncio
+async def test_expired_token_is_rejected(verifier):
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(make_token(exp=int(time.time()) - 10))
+
+@pytest.mark.asyncio
+async def test_wrong_signature_is_rejected(verifier):
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(make_token(secret="someone-elses-secret"))
+
+@pytest.mark.asyncio
+async def test_missing_secret_without_fallback_is_rejected(verifier):
+    verifier.secret = ""
+    with pytest.raises(TokenVerificationError):
+        await verifier.verify(make_token())
@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_app_import_does_not_load_heavy_modules():
+    # Fresh interpreter: this test process has pandas loaded by other tests
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('pandas', 'numpy', 'sklearn', 'openpyxl', 'supabase') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR, env={**os.environ, "PYTHONPATH": BACKEND_DIR},
+        capture_output=True, text=True, check=True,
+    )
+    assert result.stdout.strip() == ""
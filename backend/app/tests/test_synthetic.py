@@ -0,0 +1,76 @@
+import io
+import tracemalloc
+import pytest
+from pydantic import ValidationError
+from app.schemas.loan import LoanApplicationCreate
+from app.utils.file_parser import iter_transaction_batches
+from app.utils.synthetic import (
+    iter_applicants, iter_statement_chunks, parse_mix, write_statement_csv, write_statement_xlsx,
+)
+
+
+def _csv(rows: int, **options) -> bytes:
+    out = io.StringIO()
+    write_statement_csv(out, rows, **options)
+    return out.getvalue().encode()
+
+
+def test_statement_csv_parses_with_requested_mix():
+    content = _csv(5000, days=90, credit_ratio=0.2, seed=1)
+    df = next(iter_transaction_batches("s.csv", io.BytesIO(content), chunk_rows=10_000))
+
+    assert len(df) == 5000
+    assert df["Amount"].notna().all()
+    assert 0.17 < (df["Type"] == "CR").mean() < 0.23
+    dates = df["Date"].astype("datetime64[ns]")
+    assert dates.is_monotonic_increasing
+    assert (dates.max() - dates.min()).days < 90
+
+
+def test_malformed_rows_and_seeded_output():
+    assert _csv(1000, seed=3) == _csv(1000, seed=3)
+
+    rows = [row for chunk in iter_statement_chunks(20_000, malformed_rate=0.05, seed=2) for row in chunk]
+    broken = [row for row in rows if not row[1] or not row[3] or row[0].startswith("31/") or row[2] == "12,3O.x"]
+    assert 800 < len(broken) < 1200
+
+
+def test_merchant_mix_controls_descriptions():
+    weights = parse_mix(",".join(f"{name}=0" for name in parse_mix("")) + ",Uber trip=1,Salary credit ACME Corp=1")
+    descriptions = {row[1] for chunk in iter_statement_chunks(2000, weights=weights) for row in chunk}
+    assert descriptions == {"Uber trip", "Salary credit ACME Corp"}
+    with pytest.raises(ValueError):
+        parse_mix("Nobody=1")
+
+
+def test_xlsx_statement(tmp_path):
+    path = tmp_path / "s.xlsx"
+    write_statement_xlsx(path, 300)
+    with open(path, "rb") as f:
+        rows = sum(len(batch) for batch in iter_transaction_batches("s.xlsx", f))
+    assert rows == 300
+
+
+def test_statement_generation_runs_in_constant_memory():
+    class Sink:
+        def write(self, data):
+            return len(data)
+
+    tracemalloc.start()
+    write_statement_csv(Sink(), 50_000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < 10 * 1024 * 1024
+
+
+def test_applicants_match_loan_schema():
+    applicants = list(iter_applicants(500, invalid_rate=0.1, seed=4))
+    valid = invalid = 0
+    for applicant in applicants:
+        try:
+            LoanApplicationCreate.model_validate(applicant)
+            valid += 1
+        except ValidationError:
+            invalid += 1
+    assert valid + invalid == 500
+    assert 20 < invalid < 80
@@ -0,0 +1,145 @@
+import uuid
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.dependencies import get_current_user
+from app.core.executor import executor, ExecutorSaturated
+from app.db.models import Transaction, TransactionLine, UploadJob, User
+from app.db.session import Base, get_db
+from app.main import app
+
+CSV = (
+    b"Date,Description,Amount,Type\n"
+    b"2024-01-01,Salary credit,50000,CR\n"
+    b"2024-01-05,Swiggy food,400,DR\n"
+    b"2024-01-09,Uber trip,250,DR\n"
+)
+
+
+@pytest_asyncio.fixture
+async def client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uploads.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    Session = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    user = User(id=uuid.uuid4(), email="dedup@example.com", full_name="Test", phone="9999999999", city_tier=1)
+    async with Session() as db:
+        db.add(user)
+        await db.commit()
+
+    async def session():
+        async with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        ac.Session = Session
+        yield ac
+    app.dependency_overrides.clear()
+    executor.shutdown()
+    await engine.dispose()
+
+
+async def _count(Session, model) -> int:
+    async with Session() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+@pytest.mark.asyncio
+async def test_reupload_returns_existing_transaction(client):
+    first = await client.post("/api/transactions/upload", files={"file": ("jan.csv", CSV, "text/csv")})
+    second = await client.post("/api/transactions/upload", files={"file": ("jan (1).csv", CSV, "text/csv")})
+
+    assert first.status_code == second.status_code == 200
+    assert second.json()["id"] == first.json()["id"]
+    assert second.json()["analysis_result"] == first.json()["analysis_result"]
+    assert await _count(client.Session, Transaction) == 1
+    assert await _count(client.Session, TransactionLine) == 3
+
+    # Already saved, the async upload does not queue any work
+    job = await client.post("/api/transactions/upload/async", files={"file": ("jan.csv", CSV, "text/csv")})
+    assert job.status_code == 202
+    assert job.json()["status"] == "completed"
+    assert job.json()["transaction_id"] == first.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_async_reupload_joins_queued_job(client):
+    first = await client.post("/api/transactions/upload/async", files={"file": ("jan.csv", CSV, "text/csv")})
+    second = await client.post("/api/transactions/upload/async", files={"file": ("jan.csv", CSV, "text/csv")})
+
+    assert second.json()["id"] == first.json()["id"]
+    assert await _count(client.Session, UploadJob) == 1
+
+
+@pytest.mark.asyncio
+async def test_overlapping_statement_stores_only_new_lines(client):
+    await client.post("/api/transactions/upload", files={"file": ("jan.csv", CSV, "text/csv")})
+    overlapping = CSV + b"2024-02-01,Salary credit,50000,CR\n"
+    response = await client.post("/api/transactions/upload", files={"file": ("jan-feb.csv", overlapping, "text/csv")})
+
+    assert response.status_code == 200
+    assert await _count(client.Session, Transaction) == 2
+    assert await _count(client.Session, TransactionLine) == 4
+
+
+@pytest.mark.asyncio
+async def test_concurrent_save_of_same_file_returns_first_transaction(client):
+    from app.services.uploads import save_statement
+    from app.utils.file_parser import LINE_FIELDS
+
+    lines = {field: [] for field in LINE_FIELDS}
+    summary = {"row_count": 0}
+    user_id = app.dependency_overrides[get_current_user]().id
+    async with client.Session() as db:
+        first = await save_statement(db, user_id, "a.csv", lines, {"total_score": 1.0}, summary, "f" * 64)
+    # The lookup in the route missed it, the unique index catches the second insert
+    async with client.Session() as db:
+        second = await save_statement(db, user_id, "a.csv", lines, {"total_score": 2.0}, summary, "f" * 64)
+
+    assert second.id == first.id
+    assert second.analysis_result == {"total_score": 1.0}
+
+
+@pytest.mark.asyncio
+async def test_upload_errors_are_mapped_by_cause(client, monkeypatch):
+    corrupt = await client.post("/api/transactions/upload", files={"file": ("statement.xlsx", b"not a zip", "application/octet-stream")})
+    assert corrupt.status_code == 400
+    assert "not a valid .xlsx" in corrupt.json()["detail"]
+
+    async def saturated(*args, **kwargs):
+        raise ExecutorSaturated("Server is busy, please retry shortly")
+
+    monkeypatch.setattr(executor, "run_cpu", saturated)
+    busy = await client.post("/api/transactions/upload", files={"file": ("other.csv", CSV + b"\n", "text/csv")})
+    assert busy.status_code == 503
+    assert busy.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_upload_stores_lines_and_summary_only(client):
+    response = await client.post("/api/transactions/upload", files={"file": ("jan.csv", CSV, "text/csv")})
+    transaction_id = uuid.UUID(response.json()["id"])
+
+    async with client.Session() as db:
+        transaction = await db.get(Transaction, transaction_id)
+        legacy = await db.scalar(select(Transaction.transaction_data).where(Transaction.id == transaction_id))
+        lines = (await db.execute(
+            select(TransactionLine).where(TransactionLine.transaction_id == transaction_id).order_by(TransactionLine.line_no)
+        )).scalars().all()
+
+    assert legacy is None
+    assert (transaction.row_count, transaction.total_income, transaction.total_expense) == (3, 50000.0, 650.0)
+    assert (str(transaction.period_start), str(transaction.period_end)) == ("2024-01-01", "2024-01-09")
+    assert [(line.line_no, line.description, line.amount, line.type) for line in lines] == [
+        (0, "Salary credit", 50000.0, "CR"), (1, "Swiggy food", 400.0, "DR"), (2, "Uber trip", 250.0, "DR"),
+    ]
+    assert lines[1].category == "Food"
+
+    analysis = await client.get(f"/api/transactions/analyze/{transaction_id}")
+    assert analysis.json()["analysis_result"] == response.json()["analysis_result"]
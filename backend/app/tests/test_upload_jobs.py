@@ -0,0 +1,168 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.core.executor import executor
+from app.db.models import Transaction, UploadJob, User
+from app.db.session import Base, get_db
+from app.main import app
+from app.services import upload_jobs
+from app.services.upload_jobs import claim_next_job, enqueue_upload, run_job
+
+CSV = b"Date,Description,Amount,Type\n2024-01-01,Salary credit,50000,CR\n2024-01-05,Swiggy food,400,DR\n"
+
+
+@pytest_asyncio.fixture
+async def Session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    executor.shutdown()
+    await engine.dispose()
+
+
+async def _user(Session) -> User:
+    user = User(id=uuid.uuid4(), email=f"{uuid.uuid4()}@example.com", full_name="Test", phone="9999999999", city_tier=1)
+    async with Session() as db:
+        db.add(user)
+        await db.commit()
+    return user
+
+
+async def _enqueue(Session, user, content=CSV) -> uuid.UUID:
+    async with Session() as db:
+        return (await enqueue_upload(db, user.id, "statement.csv", content)).id
+
+
+async def _process_next(Session):
+    async with Session() as db:
+        job = await claim_next_job(db)
+        if job is not None:
+            await run_job(db, job, Session)
+        return job
+
+
+async def _job(Session, job_id) -> UploadJob:
+    async with Session() as db:
+        return await db.get(UploadJob, job_id)
+
+
+@pytest.mark.asyncio
+async def test_job_is_claimed_and_completed(Session):
+    user = await _user(Session)
+    job_id = await _enqueue(Session, user)
+
+    await _process_next(Session)
+
+    job = await _job(Session, job_id)
+    assert job.status == "completed"
+    assert job.progress == 100
+    assert job.payload is None
+    assert job.lease_owner is None
+    assert job.result["total_score"] is not None
+    async with Session() as db:
+        assert (await db.get(Transaction, job.transaction_id)).user_id == user.id
+    assert await _process_next(Session) is None
+
+
+@pytest.mark.asyncio
+async def test_unreadable_file_fails_without_retry(Session):
+    user = await _user(Session)
+    job_id = await _enqueue(Session, user, content=b"Date,Amount\n")
+
+    await _process_next(Session)
+
+    job = await _job(Session, job_id)
+    assert job.status == "failed"
+    assert job.attempts == 1
+    assert await _process_next(Session) is None
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_up_to_max_attempts(Session, monkeypatch):
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("database went away")
+
+    monkeypatch.setattr(upload_jobs, "save_statement", unavailable)
+    user = await _user(Session)
+    job_id = await _enqueue(Session, user)
+
+    for attempt in range(1, settings.UPLOAD_JOB_MAX_ATTEMPTS):
+        await _process_next(Session)
+        job = await _job(Session, job_id)
+        assert (job.status, job.attempts) == ("queued", attempt)
+
+    await _process_next(Session)
+    job = await _job(Session, job_id)
+    assert (job.status, job.attempts) == ("failed", settings.UPLOAD_JOB_MAX_ATTEMPTS)
+    assert job.error == "database went away"
+
+
+@pytest.mark.asyncio
+async def test_only_expired_leases_are_taken_over(Session):
+    user = await _user(Session)
+    job_id = await _enqueue(Session, user)
+    async with Session() as db:
+        first = await claim_next_job(db)
+
+    # Still leased to a live worker, however long it has been running
+    assert await _process_next(Session) is None
+
+    async with Session() as db:
+        await db.execute(update(UploadJob).values(lease_expires_at=datetime.now(timezone.utc) - timedelta(seconds=1)))
+        await db.commit()
+    second = await _process_next(Session)
+    assert second.id == job_id
+    assert second.lease_owner != first.lease_owner
+
+    # The first worker comes back: its writes are ignored
+    async with Session() as db:
+        await run_job(db, first, Session)
+    job = await _job(Session, job_id)
+    assert job.status == "completed"
+    assert job.attempts == 2
+    async with Session() as db:
+        assert len((await db.execute(select(Transaction))).scalars().all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_job_is_not_rerun_past_max_attempts(Session):
+    user = await _user(Session)
+    job_id = await _enqueue(Session, user)
+    async with Session() as db:
+        await db.execute(update(UploadJob).values(status="processing", attempts=settings.UPLOAD_JOB_MAX_ATTEMPTS))
+        await db.commit()
+
+    assert await _process_next(Session) is None
+    job = await _job(Session, job_id)
+    assert job.status == "failed"
+    assert job.payload is None
+
+
+@pytest.mark.asyncio
+async def test_job_status_is_only_visible_to_its_owner(Session):
+    owner, other = await _user(Session), await _user(Session)
+    job_id = await _enqueue(Session, owner)
+
+    async def session():
+        async with Session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = session
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            app.dependency_overrides[get_current_user] = lambda: other
+            assert (await client.get(f"/api/transactions/jobs/{job_id}")).status_code == 403
+            app.dependency_overrides[get_current_user] = lambda: owner
+            response = await client.get(f"/api/transactions/jobs/{job_id}")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert response.json()["status"] == "queued"
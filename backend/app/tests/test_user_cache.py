@@ -0,0 +1,41 @@
+import uuid
+from sqlalchemy import inspect
+from app.core.user_cache import UserCache
+from app.db.models import User
+
+def make_user():
+    return User(id=uuid.uuid4(), email="user@example.com", full_name="Test", phone="9999999999", city_tier=1)
+
+def test_cache_returns_detached_snapshot():
+    cache = UserCache(max_size=10, ttl_seconds=60)
+    user = make_user()
+    cache.set(str(user.id), user)
+
+    cached = cache.get(str(user.id))
+    assert cached is not user
+    assert cached.email == user.email
+    assert inspect(cached).session is None
+    assert cache.stats()["hits"] == 1
+
+def test_cache_evicts_least_recently_used():
+    cache = UserCache(max_size=2, ttl_seconds=60)
+    first, second, third = make_user(), make_user(), make_user()
+    cache.set(str(first.id), first)
+    cache.set(str(second.id), second)
+    cache.get(str(first.id))
+    cache.set(str(third.id), third)
+
+    assert cache.get(str(second.id)) is None
+    assert cache.get(str(first.id)) is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_expires_and_invalidates():
+    cache = UserCache(max_size=10, ttl_seconds=-1)
+    user = make_user()
+    cache.set(str(user.id), user)
+    assert cache.get(str(user.id)) is None
+
+    cache.ttl_seconds = 60
+    cache.set(str(user.id), user)
+    cache.invalidate(user.id)
+    assert cache.get(str(user.id)) is None
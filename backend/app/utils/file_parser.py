@@ -1,19 +1,189 @@
-import pandas as pd
-from fastapi import UploadFile, HTTPException
+import hashlib
+import zipfile
+from typing import TYPE_CHECKING, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from app.core.config import settings
+from app.utils.validators import validate_file_size
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas is imported inside the parsing functions, so the routers can use the
+# size checks below without loading it at startup
+
+# Expected: Date, Description, Amount, Type
+# Everything is read as text first; Amount is then coerced to float64 so a
+# malformed cell becomes NaN instead of turning the whole column into objects
+TEXT_COLUMNS = ["Date", "Description", "Type"]
+NUMERIC_COLUMNS = ["Amount"]
+READ_DTYPES = {column: str for column in TEXT_COLUMNS + NUMERIC_COLUMNS}
+SUPPORTED_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+READ_BLOCK_SIZE = 1024 * 1024
+
+# Columnar layout of transaction_lines handed back to the web process
+LINE_FIELDS = ["line_no", "date", "description", "amount", "type", "category", "extra"]
+
+
+class FileTooLargeError(ValueError):
+    pass
+
+
+class UnsupportedFileError(ValueError):
+    pass
+
+
+def is_supported_file(filename: str) -> bool:
+    return bool(filename) and filename.endswith(SUPPORTED_EXTENSIONS)
+
+
+class LimitedReader:
+    """
+    File wrapper that fails as soon as more than `limit_mb` has been read,
+    optionally feeding everything it reads into a hashlib `digest`
+    """
+
+    def __init__(self, raw: BinaryIO, limit_mb: int, digest=None):
+        self.raw = raw
+        self.limit_mb = limit_mb
+        self.digest = digest
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        self.bytes_read += len(data)
+        if not validate_file_size(self.bytes_read, self.limit_mb):
+            raise FileTooLargeError(f"File exceeds the {self.limit_mb} MB upload limit")
+        if self.digest is not None:
+            self.digest.update(data)
+        return data
+
+    def __iter__(self):
+        return iter(self.read, b"")
+
+
+def line_fingerprints(lines: Dict[str, list]) -> List[Optional[str]]:
+    """
+    Identity of each statement line for de-duplication across overlapping
+    statements: date, amount, type and normalized description, plus how many
+    identical lines came before it in the same statement (two equal coffees
+    on one day are two purchases). Undated lines get None.
+    """
+    seen: Dict[str, int] = {}
+    fingerprints: List[Optional[str]] = []
+    for day, amount, kind, description in zip(lines["date"], lines["amount"], lines["type"], lines["description"]):
+        if day is None:
+            fingerprints.append(None)
+            continue
+        key = "|".join([
+            day.isoformat(),
+            f"{amount:.2f}" if amount is not None else "",
+            kind or "",
+            " ".join(str(description).lower().split()) if description is not None else "",
+        ])
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        fingerprints.append(hashlib.blake2b(f"{key}|{occurrence}".encode(), digest_size=16).hexdigest())
+    return fingerprints
+
+
+def read_upload(fileobj: BinaryIO, limit_mb: int) -> Tuple[bytes, str]:
+    """
+    Read an uploaded file, failing as soon as it exceeds the size limit.
+    Returns the content and its SHA-256 (hex), hashed while reading.
+    """
+    reader = LimitedReader(fileobj, limit_mb, digest=hashlib.sha256())
+    content = b"".join(iter(lambda: reader.read(READ_BLOCK_SIZE), b""))
+    return content, reader.digest.hexdigest()
+
+
+def _coerce_types(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Give every batch the same explicit dtypes regardless of file format"""
+    import pandas as pd
+
+    for column in TEXT_COLUMNS:
+        if column in df.columns:
+            values = df[column]
+            df[column] = values.where(values.isna(), values.astype(str))
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+    return df
+
+
+def _check_size(fileobj: BinaryIO, limit_mb: int):
+    fileobj.seek(0, 2)
+    if not validate_file_size(fileobj.tell(), limit_mb):
+        raise FileTooLargeError(f"File exceeds the {limit_mb} MB upload limit")
+    fileobj.seek(0)
+
+
+def _iter_csv(fileobj: BinaryIO, chunk_rows: int, limit_mb: int) -> Iterator["pd.DataFrame"]:
+    import pandas as pd
+
+    reader = LimitedReader(fileobj, limit_mb)
+    for chunk in pd.read_csv(reader, chunksize=chunk_rows, dtype=READ_DTYPES):
+        yield _coerce_types(chunk)
+
+
+def _iter_xlsx(fileobj: BinaryIO, chunk_rows: int, limit_mb: int) -> Iterator["pd.DataFrame"]:
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    # XLSX is a zip archive, so it has to be complete on disk before it can be
+    # opened; check its size up front, then stream rows in read-only mode
+    _check_size(fileobj, limit_mb)
 
-async def parse_transaction_file(file: UploadFile) -> pd.DataFrame:
     try:
-        if file.filename.endswith('.csv'):
-            df = pd.read_csv(file.file)
-        elif file.filename.endswith(('.xls', '.xlsx')):
-            df = pd.read_excel(file.file)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid file format")
-        
-        # Standardize columns
-        # Map common bank export columns to standard ones
-        # Expected: Date, Description, Amount, Type
-        
-        return df
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, KeyError):
+        raise UnsupportedFileError("File is not a valid .xlsx workbook")
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+
+        batch = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            batch.append(row)
+            if len(batch) >= chunk_rows:
+                yield _coerce_types(pd.DataFrame(batch, columns=columns))
+                batch = []
+        if batch:
+            yield _coerce_types(pd.DataFrame(batch, columns=columns))
+    finally:
+        workbook.close()
+
+
+def iter_transaction_batches(
+    filename: str,
+    fileobj: BinaryIO,
+    chunk_rows: int = None,
+    limit_mb: int = None
+) -> Iterator["pd.DataFrame"]:
+    """
+    Stream a bank statement as typed DataFrame batches of at most `chunk_rows`
+    rows, enforcing the upload size limit while reading.
+    """
+    chunk_rows = chunk_rows or settings.UPLOAD_CHUNK_ROWS
+    limit_mb = limit_mb or settings.MAX_UPLOAD_MB
+
+    if filename.endswith('.csv'):
+        yield from _iter_csv(fileobj, chunk_rows, limit_mb)
+    elif filename.endswith('.xlsx'):
+        yield from _iter_xlsx(fileobj, chunk_rows, limit_mb)
+    elif filename.endswith('.xls'):
+        # Legacy binary format has no streaming reader
+        import pandas as pd
+
+        _check_size(fileobj, limit_mb)
+        try:
+            frame = pd.read_excel(fileobj, dtype=READ_DTYPES)
+        except ImportError:
+            raise UnsupportedFileError("Legacy .xls files need the optional xlrd package, upload .xlsx or .csv")
+        yield _coerce_types(frame)
+    else:
+        # Plain exception so it survives being raised inside a worker process
+        raise UnsupportedFileError("Invalid file format")
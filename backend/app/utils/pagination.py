@@ -0,0 +1,50 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+from sqlalchemy import Select, literal, tuple_
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, id) -> str:
+    """Opaque cursor pointing at the last row of a page"""
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), UUID(data["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+def keyset_page(query: Select, model, cursor: Optional[str], limit: int) -> Select:
+    """
+    Newest-first page of `query` ordered by (created_at, id).
+
+    Rows are fetched after the cursor position instead of using OFFSET, so
+    deep pages cost the same as the first one. One extra row is requested
+    to tell whether another page exists (see next_cursor).
+    """
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        # Typed binds so the UUID/datetime are converted like column values
+        position = tuple_(literal(created_at, model.created_at.type), literal(last_id, model.id.type))
+        query = query.where(tuple_(model.created_at, model.id) < position)
+    return query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def next_cursor(rows: list, limit: int) -> Tuple[list, Optional[str]]:
+    """Trim the look-ahead row and return (page, cursor for the next page)"""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
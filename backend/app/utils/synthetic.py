@@ -0,0 +1,258 @@
+"""
+Synthetic bank statements and loan applicants for scale testing.
+
+Statements are generated in fixed-size chunks and written as they are
+produced, so memory use does not depend on the number of rows. Everything
+is reproducible from `seed`.
+
+    python -m app.utils.synthetic statements --rows 5000000 --days 730 \\
+        --credit-ratio 0.08 --malformed-rate 0.001 --out statement.csv
+    python -m app.utils.synthetic statements --rows 200000 --out statement.xlsx
+    python -m app.utils.synthetic applicants --count 1000000 --out applicants.ndjson
+"""
+import argparse
+import csv
+import json
+import sys
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, TextIO, Tuple
+import numpy as np
+
+STATEMENT_COLUMNS = ["Date", "Description", "Amount", "Type"]
+CHUNK_ROWS = 10_000
+
+# description -> (type, min amount, max amount); keywords match app/data/category_rules.json
+MERCHANTS: Dict[str, Tuple[str, float, float]] = {
+    "Salary credit ACME Corp": ("CR", 30_000, 150_000),
+    "Cash deposit branch": ("CR", 1_000, 20_000),
+    "Refund Amazon": ("CR", 200, 5_000),
+    "Swiggy food order": ("DR", 100, 1_500),
+    "Grocer BigBasket": ("DR", 300, 6_000),
+    "Uber trip": ("DR", 80, 900),
+    "Fuel HP petrol pump": ("DR", 500, 4_000),
+    "Home loan EMI": ("DR", 8_000, 45_000),
+    "Stock invest SIP": ("DR", 1_000, 25_000),
+    "Amazon shopping": ("DR", 200, 15_000),
+    "Electricity bill": ("DR", 600, 4_500),
+    "Rent transfer": ("DR", 8_000, 40_000),
+}
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "Salary credit ACME Corp": 1, "Cash deposit branch": 2, "Refund Amazon": 1,
+    "Swiggy food order": 12, "Grocer BigBasket": 8, "Uber trip": 10, "Fuel HP petrol pump": 4,
+    "Home loan EMI": 1, "Stock invest SIP": 1, "Amazon shopping": 6, "Electricity bill": 1, "Rent transfer": 1,
+}
+
+MALFORMED_KINDS = ["date", "amount", "type", "description"]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """"Uber trip=3,Rent transfer=0.5" -> weights overriding DEFAULT_WEIGHTS"""
+    weights = dict(DEFAULT_WEIGHTS)
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, weight = item.rpartition("=")
+        if name not in MERCHANTS:
+            raise ValueError(f"Unknown merchant {name!r}, choose from: {', '.join(MERCHANTS)}")
+        weights[name] = float(weight)
+    return weights
+
+
+def _side(weights: Dict[str, float], kind: str) -> Tuple[List[str], np.ndarray]:
+    names = [name for name, (side, _, _) in MERCHANTS.items() if side == kind and weights.get(name, 0) > 0]
+    if not names:
+        raise ValueError(f"The merchant mix has no {kind} merchants")
+    p = np.array([weights[name] for name in names], dtype=float)
+    return names, p / p.sum()
+
+
+def iter_statement_chunks(
+    rows: int,
+    start: date = date(2023, 1, 1),
+    days: int = 365,
+    credit_ratio: float = 0.1,
+    weights: Optional[Dict[str, float]] = None,
+    malformed_rate: float = 0.0,
+    seed: int = 0,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[List[list]]:
+    """
+    Yield statement rows ([Date, Description, Amount, Type] as text-ready
+    values) in chunks of `chunk_rows`, dated in order across `days`.
+    `malformed_rate` of the rows get one broken field (unparseable date or
+    amount, missing type or description).
+    """
+    rng = np.random.default_rng(seed)
+    weights = weights or DEFAULT_WEIGHTS
+    credit_names, credit_p = _side(weights, "CR") if credit_ratio > 0 else ([], None)
+    debit_names, debit_p = _side(weights, "DR") if credit_ratio < 1 else ([], None)
+    start_at = datetime.combine(start, datetime.min.time())
+    span_seconds = days * 86400
+
+    for offset in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - offset)
+        # Evenly spread over the span, so rows come out sorted without buffering
+        seconds = (np.arange(offset, offset + n, dtype=np.int64) * span_seconds) // max(rows, 1)
+        is_credit = rng.random(n) < credit_ratio
+
+        descriptions = np.empty(n, dtype=object)
+        if credit_names:
+            descriptions[is_credit] = rng.choice(credit_names, is_credit.sum(), p=credit_p)
+        if debit_names:
+            descriptions[~is_credit] = rng.choice(debit_names, (~is_credit).sum(), p=debit_p)
+
+        low = np.array([MERCHANTS[d][1] for d in descriptions])
+        high = np.array([MERCHANTS[d][2] for d in descriptions])
+        amounts = np.round(low + rng.random(n) * (high - low), 2)
+
+        chunk = [
+            [(start_at + timedelta(seconds=int(s))).strftime("%Y-%m-%d"), d, a, "CR" if c else "DR"]
+            for s, d, a, c in zip(seconds.tolist(), descriptions.tolist(), amounts.tolist(), is_credit.tolist())
+        ]
+
+        if malformed_rate > 0:
+            for i in np.flatnonzero(rng.random(n) < malformed_rate).tolist():
+                kind = MALFORMED_KINDS[rng.integers(len(MALFORMED_KINDS))]
+                if kind == "date":
+                    chunk[i][0] = "31/13/20xx"
+                elif kind == "amount":
+                    chunk[i][2] = "12,3O.x"
+                elif kind == "type":
+                    chunk[i][3] = ""
+                else:
+                    chunk[i][1] = ""
+        yield chunk
+
+
+def write_statement_csv(out: TextIO, rows: int, **options) -> int:
+    writer = csv.writer(out)
+    writer.writerow(STATEMENT_COLUMNS)
+    written = 0
+    for chunk in iter_statement_chunks(rows, **options):
+        writer.writerows(chunk)
+        written += len(chunk)
+    return written
+
+
+def write_statement_xlsx(path, rows: int, **options) -> int:
+    from openpyxl import Workbook
+
+    # Write-only mode streams rows to disk instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Statement")
+    sheet.append(STATEMENT_COLUMNS)
+    written = 0
+    for chunk in iter_statement_chunks(rows, **options):
+        for row in chunk:
+            sheet.append(row)
+        written += len(chunk)
+    workbook.save(path)
+    return written
+
+
+def statement_frame(rows: int, **options):
+    """Whole statement as a DataFrame of text columns, as a parser would see it (in memory)"""
+    import pandas as pd
+
+    chunks = [pd.DataFrame(chunk, columns=STATEMENT_COLUMNS) for chunk in iter_statement_chunks(rows, **options)]
+    frame = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=STATEMENT_COLUMNS)
+    return frame.astype({"Amount": str})
+
+
+def iter_applicants(count: int, invalid_rate: float = 0.0, seed: int = 0, chunk_rows: int = CHUNK_ROWS) -> Iterator[dict]:
+    """
+    Loan applicants shaped like LoanApplicationCreate, with loosely realistic
+    correlations (assets, debt and EMIs scale with income). `invalid_rate` of
+    them fail validation (missing or non-numeric field).
+    """
+    rng = np.random.default_rng(seed)
+    for offset in range(0, count, chunk_rows):
+        n = min(chunk_rows, count - offset)
+        income = np.round(rng.lognormal(mean=10.8, sigma=0.6, size=n), -2)
+        num_debts = np.minimum(rng.poisson(1.2, n), 10)
+        total_debt = np.round(num_debts * rng.uniform(20_000, 300_000, n), 2)
+        invalid = rng.random(n) < invalid_rate
+
+        columns = {
+            "amount_requested": np.round(income * rng.uniform(0.5, 20, n), -3),
+            "num_debts": num_debts,
+            "total_debt_amount": total_debt,
+            "monthly_emis": np.round(total_debt * rng.uniform(0.02, 0.05, n), 2),
+            "total_assets": np.round(income * rng.uniform(0, 60, n), 2),
+            "monthly_income": income,
+        }
+        names = list(columns)
+        for i, values in enumerate(zip(*(columns[name].tolist() for name in names))):
+            applicant = dict(zip(names, values))
+            if invalid[i]:
+                broken = names[i % len(names)]
+                if i % 2:
+                    del applicant[broken]
+                else:
+                    applicant[broken] = "n/a"
+            yield applicant
+
+
+def write_applicants(out: TextIO, count: int, fmt: str = "ndjson", **options) -> int:
+    written = 0
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=[
+            "amount_requested", "num_debts", "total_debt_amount", "monthly_emis", "total_assets", "monthly_income",
+        ])
+        writer.writeheader()
+    for applicant in iter_applicants(count, **options):
+        if fmt == "csv":
+            writer.writerow(applicant)
+        else:
+            out.write(json.dumps(applicant) + "\n")
+        written += 1
+    return written
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    statements = commands.add_parser("statements", help="bank statement as CSV or XLSX")
+    statements.add_argument("--rows", type=int, required=True)
+    statements.add_argument("--out", default="-", help="file path (.csv/.xlsx) or - for CSV on stdout")
+    statements.add_argument("--start", type=date.fromisoformat, default=date(2023, 1, 1))
+    statements.add_argument("--days", type=int, default=365)
+    statements.add_argument("--credit-ratio", type=float, default=0.1)
+    statements.add_argument("--merchant-mix", default="", help='weights, e.g. "Uber trip=3,Rent transfer=0.5"')
+    statements.add_argument("--malformed-rate", type=float, default=0.0)
+    statements.add_argument("--seed", type=int, default=0)
+
+    applicants = commands.add_parser("applicants", help="LoanApplicationCreate payloads as NDJSON or CSV")
+    applicants.add_argument("--count", type=int, required=True)
+    applicants.add_argument("--out", default="-")
+    applicants.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    applicants.add_argument("--invalid-rate", type=float, default=0.0)
+    applicants.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "statements":
+        options = dict(
+            start=args.start, days=args.days, credit_ratio=args.credit_ratio,
+            weights=parse_mix(args.merchant_mix), malformed_rate=args.malformed_rate, seed=args.seed,
+        )
+        if args.out.endswith(".xlsx"):
+            written = write_statement_xlsx(args.out, args.rows, **options)
+        elif args.out == "-":
+            written = write_statement_csv(sys.stdout, args.rows, **options)
+        else:
+            with open(args.out, "w", newline="", encoding="utf-8") as f:
+                written = write_statement_csv(f, args.rows, **options)
+    else:
+        options = dict(invalid_rate=args.invalid_rate, seed=args.seed)
+        if args.out == "-":
+            written = write_applicants(sys.stdout, args.count, args.format, **options)
+        else:
+            with open(args.out, "w", newline="", encoding="utf-8") as f:
+                written = write_applicants(f, args.count, args.format, **options)
+
+    print(f"wrote {written} rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
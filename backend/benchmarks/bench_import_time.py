@@ -0,0 +1,102 @@
+"""
+Cold-start cost of `import app.main`, measured in fresh interpreters.
+
+Reports the wall time of the import (min/median over N runs), the slowest
+modules from `python -X importtime`, and whether any module that should be
+loaded lazily (pandas, NumPy, openpyxl, the Supabase SDK, ...) was pulled in.
+
+Run from backend/:  python -m benchmarks.bench_import_time [--repeat N] [--top N] [--max-seconds S]
+
+Exits with status 1 if a lazy module is imported at startup or the median
+exceeds --max-seconds.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported when a request needs them
+LAZY_MODULES = ["pandas", "numpy", "sklearn", "openpyxl", "supabase", "app.ml.credit_model", "app.services.statements"]
+
+TIMED_IMPORT = f"""
+import sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+loaded = [name for name in {LAZY_MODULES!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+    env.setdefault("SUPABASE_KEY", "bench")
+    env.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+    env["PYTHONPATH"] = BACKEND_DIR
+    # Compiled bytecode is cached after the first run, like a deployed image
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def timed_import() -> Tuple[float, List[str]]:
+    out = subprocess.run(
+        [sys.executable, "-c", TIMED_IMPORT],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()[-1]
+    elapsed, loaded = out.split(" ", 1) if " " in out else (out, "")
+    return float(elapsed), [name for name in loaded.split(",") if name]
+
+
+def slowest_modules(top: int) -> List[Tuple[int, str]]:
+    """(cumulative microseconds, module) for the slowest imports"""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    ).stderr
+
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.rstrip()))
+    modules.sort(reverse=True)
+    return modules[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    # Warm-up run writes the bytecode cache
+    timed_import()
+    runs = [timed_import() for _ in range(args.repeat)]
+    times = [elapsed for elapsed, _ in runs]
+    loaded = sorted({name for _, names in runs for name in names})
+    median = statistics.median(times)
+
+    print(f"import app.main: min {min(times) * 1000:.0f} ms, median {median * 1000:.0f} ms over {args.repeat} runs")
+    print("\nslowest imports (cumulative):")
+    for cumulative, name in slowest_modules(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        print(f"\nimported at startup but should be lazy: {', '.join(loaded)}")
+        failed = True
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"\nmedian {median:.3f}s exceeds --max-seconds {args.max_seconds}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Serialization cost of typical responses, per response path:
+
+  default      response_model validation + jsonable output + stdlib JSONResponse
+  orjson       response_model validation + FastJSONResponse (orjson)
+  prevalidated FastJSONResponse on data already in response shape (no re-validation)
+
+Run from backend/:  python -m benchmarks.bench_serialization [--repeat N]
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from app.core.responses import FastJSONResponse
+from app.db.models import LoanApplication, Transaction
+from app.ml.behavior_scoring import analyze_behavior
+from app.schemas.loan import LoanApplicationResponse, LoanBulkApplyResponse, LoanScoreBatchResponse
+from app.schemas.transaction import TransactionResponse
+
+
+def _statement(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    merchants = ["Salary credit", "Swiggy food order", "Uber trip", "Amazon shopping", "Electricity bill", "Rent"]
+    return pd.DataFrame({
+        "Date": pd.date_range("2023-01-01", periods=rows, freq="h"),
+        "Description": rng.choice(merchants, rows),
+        "Amount": rng.uniform(50, 50000, rows).round(2),
+        "Type": rng.choice(["CR", "DR"], rows, p=[0.1, 0.9]),
+    })
+
+
+def _loan(user_id, i: int) -> LoanApplication:
+    return LoanApplication(
+        id=uuid.uuid4(), user_id=user_id, amount_requested=100000.0 + i, num_debts=i % 4,
+        total_debt_amount=5000.0 * (i % 7), monthly_emis=1200.0, total_assets=250000.0,
+        monthly_income=60000.0, ml_score=0.61, acceptance_rate=61.0, status="pending",
+        feedback={"note": "Automated scoring applied"}, created_at=datetime.now(timezone.utc),
+    )
+
+
+def build_cases():
+    user_id = uuid.uuid4()
+    analysis = analyze_behavior(_statement(20000))
+    transaction = Transaction(id=uuid.uuid4(), user_id=user_id, file_name="statement.csv", analysis_result=analysis)
+    loans = [_loan(user_id, i) for i in range(200)]
+    bulk = [
+        {"index": i, "status": "created", "loan": LoanApplicationResponse.model_validate(loan).model_dump(), "error": None}
+        for i, loan in enumerate(_loan(user_id, i) for i in range(1000))
+    ]
+    scores = [{"ml_score": s, "acceptance_rate": s * 100, "status": "pending"} for s in np.random.default_rng(1).random(10000).tolist()]
+
+    return [
+        # name, response model, ORM/raw content, equivalent prevalidated content
+        ("upload analysis", TransactionResponse, transaction,
+         {"id": transaction.id, "user_id": user_id, "file_name": transaction.file_name, "analysis_result": analysis}),
+        ("loan list x200", List[LoanApplicationResponse], loans,
+         [LoanApplicationResponse.model_validate(loan) for loan in loans]),
+        ("bulk apply x1000", LoanBulkApplyResponse, {"created": 1000, "failed": 0, "truncated": False, "results": bulk},
+         {"created": 1000, "failed": 0, "truncated": False, "results": bulk}),
+        ("score batch x10000", LoanScoreBatchResponse, {"scores": scores}, {"scores": scores}),
+    ]
+
+
+def _time(fn, repeat: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(repeat: int) -> list:
+    loop = asyncio.new_event_loop()
+    results = []
+    for name, model, content, raw in build_cases():
+        field = create_response_field(name="response", type_=model, mode="serialization")
+
+        def validated(response_class):
+            body = loop.run_until_complete(serialize_response(field=field, response_content=content))
+            return response_class(body).body
+
+        timings = {
+            "default": _time(lambda: validated(JSONResponse), repeat),
+            "orjson": _time(lambda: validated(FastJSONResponse), repeat),
+            "prevalidated": _time(lambda: FastJSONResponse(raw).body, repeat),
+        }
+        results.append((name, timings))
+    loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'payload':<20}{'default ms':>12}{'orjson ms':>12}{'prevalidated ms':>17}")
+    for name, timings in run(args.repeat):
+        print(f"{name:<20}{timings['default']:>12.2f}{timings['orjson']:>12.2f}{timings['prevalidated']:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Benchmark suite for the API hot paths.
+
+  model.*       CreditScoringModel.predict / predict_batch
+  behavior.*    analyze_behavior on synthetic statements (1k / 100k / 1M rows,
+                app.utils.synthetic)
+  parse.*       streaming CSV / XLSX statement parsing
+  api.*         /loans/apply and /transactions/upload end to end (ASGI, auth stubbed)
+
+The API cases run against a throwaway SQLite file, or against the database in
+BENCH_DATABASE_URL (e.g. a local Postgres), whose schema is created if missing.
+
+Run from backend/:
+  python -m benchmarks.run [--quick] [--only NAME] [--output results.json]
+                           [--baseline baseline.json] [--tolerance 0.25]
+
+Results (median/min seconds per operation) are written as JSON. With
+--baseline, every case whose median is more than `tolerance` slower than the
+baseline is reported and the exit status is 1, so CI can fail the build.
+Save a run's output as the baseline on the machine that runs the comparison.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+_bench_dir = tempfile.mkdtemp(prefix="credbud-bench-")
+os.environ.setdefault("SUPABASE_URL", "https://bench.supabase.co")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+os.environ["DATABASE_URL"] = os.environ.get("BENCH_DATABASE_URL") or f"sqlite+aiosqlite:///{_bench_dir}/bench.db"
+os.environ.setdefault("APP_ENV", "test")
+os.environ.setdefault("DB_SSLMODE", "")
+os.environ.setdefault("UPLOAD_JOBS_ENABLED", "false")
+
+import numpy as np
+from app.utils.synthetic import statement_frame, write_statement_csv, write_statement_xlsx
+
+APPLICATION = {
+    "amount_requested": 250000.0, "num_debts": 1, "total_debt_amount": 40000.0,
+    "monthly_emis": 3500.0, "total_assets": 600000.0, "monthly_income": 65000.0,
+}
+
+
+class Case:
+    def __init__(self, name: str, fn: Callable, repeat: int = 5, before_each: Optional[Callable] = None, ops: int = 1):
+        self.name = name
+        self.fn = fn
+        self.repeat = repeat
+        # Untimed, builds a fresh argument for each run (e.g. a DataFrame the function mutates)
+        self.before_each = before_each
+        # Operations per call, for throughput
+        self.ops = ops
+
+
+def statement_csv(rows: int) -> bytes:
+    out = io.StringIO()
+    write_statement_csv(out, rows)
+    return out.getvalue().encode()
+
+
+def statement_xlsx(rows: int) -> bytes:
+    path = os.path.join(_bench_dir, f"statement-{rows}.xlsx")
+    write_statement_xlsx(path, rows)
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def model_cases() -> List[Case]:
+    from app.ml.credit_model import credit_model
+
+    features = [APPLICATION["monthly_income"] * 12, APPLICATION["total_assets"], APPLICATION["total_debt_amount"],
+                APPLICATION["num_debts"], APPLICATION["monthly_emis"], APPLICATION["amount_requested"]]
+    batch = np.tile(features, (100_000, 1))
+    return [
+        Case("model.predict", lambda: credit_model.predict(features), repeat=2000),
+        Case("model.predict_batch_100k", lambda: credit_model.predict_batch(batch), repeat=20, ops=len(batch)),
+    ]
+
+
+def behavior_cases(sizes: List[int]) -> List[Case]:
+    from app.ml.behavior_scoring import analyze_behavior
+
+    cases = []
+    for rows in sizes:
+        frame = statement_frame(rows)
+        holder = {}
+        cases.append(Case(
+            f"behavior.analyze_{rows}",
+            lambda holder=holder: analyze_behavior(holder["df"]),
+            repeat=5 if rows <= 100_000 else 1,
+            # analyze_behavior converts columns in place, time it on a fresh text-typed copy
+            before_each=lambda holder=holder, frame=frame: holder.update(df=frame.copy()),
+            ops=rows,
+        ))
+    return cases
+
+
+def parse_cases() -> List[Case]:
+    from app.utils.file_parser import iter_transaction_batches
+
+    csv = statement_csv(100_000)
+    xlsx = statement_xlsx(10_000)
+
+    def parse(filename: str, content: bytes):
+        for _ in iter_transaction_batches(filename, io.BytesIO(content), limit_mb=1024):
+            pass
+
+    return [
+        Case("parse.csv_100k", lambda: parse("statement.csv", csv), repeat=5, ops=100_000),
+        Case("parse.xlsx_10k", lambda: parse("statement.xlsx", xlsx), repeat=3, ops=10_000),
+    ]
+
+
+def api_cases(loop: asyncio.AbstractEventLoop) -> List[Case]:
+    from httpx import AsyncClient
+    from app.core.dependencies import get_current_user
+    from app.db.models import User
+    from app.db.session import Base, SessionLocal, engine
+    from app.main import app
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        user_id = uuid.uuid4()
+        async with SessionLocal() as db:
+            user = User(id=user_id, email=f"bench-{user_id}@example.com", full_name="Bench", phone="9999999999", city_tier=1)
+            db.add(user)
+            await db.commit()
+        return user
+
+    user = loop.run_until_complete(setup())
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = AsyncClient(app=app, base_url="http://bench")
+    upload = statement_csv(5_000)
+
+    async def apply(requests: int):
+        for _ in range(requests):
+            response = await client.post("/api/loans/apply", json=APPLICATION)
+            response.raise_for_status()
+
+    async def upload_statement():
+        response = await client.post("/api/transactions/upload", files={"file": ("statement.csv", upload, "text/csv")})
+        response.raise_for_status()
+
+    return [
+        Case("api.loans_apply_x50", lambda: loop.run_until_complete(apply(50)), repeat=5, ops=50),
+        Case("api.transactions_upload_5k_rows", lambda: loop.run_until_complete(upload_statement()), repeat=5),
+    ]
+
+
+def measure(case: Case) -> Dict[str, float]:
+    # One untimed warm-up (imports, pools, caches)
+    if case.before_each:
+        case.before_each()
+    case.fn()
+
+    timings = []
+    for _ in range(case.repeat):
+        if case.before_each:
+            case.before_each()
+        start = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return {
+        "median_seconds": median,
+        "min_seconds": min(timings),
+        "repeat": case.repeat,
+        "ops_per_second": case.ops / median if median > 0 else None,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = result["median_seconds"] / previous["median_seconds"]
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: {ratio:.2f}x slower than baseline")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="skip the 1M-row statement")
+    parser.add_argument("--only", default="", help="run cases whose name contains this")
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    sizes = [1_000, 100_000] + ([] if args.quick else [1_000_000])
+    cases = model_cases() + behavior_cases(sizes) + parse_cases() + api_cases(loop)
+
+    results = {}
+    for case in cases:
+        if args.only not in case.name:
+            continue
+        results[case.name] = measure(case)
+        result = results[case.name]
+        print(f"{case.name:<36}{result['median_seconds'] * 1000:>12.2f} ms{result['ops_per_second'] or 0:>16.0f} ops/s")
+
+    loop.run_until_complete(_dispose())
+    loop.close()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "database": os.environ["DATABASE_URL"].split("://")[0],
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+async def _dispose():
+    from app.db.session import engine
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Baseline schema (users, loan applications, transactions, behaviour)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+
+Databases created by the old create_all() startup hook already have these
+tables; they are only created when missing, so `alembic upgrade head`
+adopts such databases as well as empty ones.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade() -> None:
+    if not _has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("email", sa.String(), nullable=False),
+            sa.Column("full_name", sa.String(), nullable=False),
+            sa.Column("phone", sa.String(), nullable=False),
+            sa.Column("city_tier", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+        op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    if not _has_table("loan_applications"):
+        op.create_table(
+            "loan_applications",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id")),
+            sa.Column("amount_requested", sa.Float(), nullable=False),
+            sa.Column("num_debts", sa.Integer(), nullable=False),
+            sa.Column("total_debt_amount", sa.Float(), nullable=False),
+            sa.Column("monthly_emis", sa.Float(), nullable=False),
+            sa.Column("total_assets", sa.Float(), nullable=False),
+            sa.Column("monthly_income", sa.Float(), nullable=False),
+            sa.Column("ml_score", sa.Float(), nullable=True),
+            sa.Column("acceptance_rate", sa.Float(), nullable=True),
+            sa.Column("status", sa.String(), nullable=True),
+            sa.Column("feedback", JSONType, nullable=True),
+        )
+
+    if not _has_table("transactions"):
+        op.create_table(
+            "transactions",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id")),
+            sa.Column("file_name", sa.String(), nullable=False),
+            sa.Column("transaction_data", JSONType, nullable=False),
+            sa.Column("analysis_result", JSONType, nullable=True),
+        )
+
+    if not _has_table("financial_behavior"):
+        op.create_table(
+            "financial_behavior",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id")),
+            sa.Column("total_score", sa.Float(), nullable=True),
+            sa.Column("behavior_rating", sa.String(), nullable=True),
+            sa.Column("category_scores", JSONType, nullable=True),
+            sa.Column("liquidity_resilience_days", sa.Integer(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("financial_behavior")
+    op.drop_table("transactions")
+    op.drop_table("loan_applications")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_table("users")
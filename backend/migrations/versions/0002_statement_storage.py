@@ -0,0 +1,91 @@
+"""Statement lines, upload jobs and per-statement aggregates
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+SUMMARY_COLUMNS = {
+    "row_count": sa.Integer,
+    "period_start": sa.Date,
+    "period_end": sa.Date,
+    "total_income": sa.Float,
+    "total_expense": sa.Float,
+}
+
+
+def _has_table(name: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def _columns(table: str) -> set:
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    existing = _columns("transactions")
+    with op.batch_alter_table("transactions") as batch:
+        # Lines moved to transaction_lines, the JSON copy is legacy
+        batch.alter_column("transaction_data", existing_type=JSONType, nullable=True)
+        for name, type_ in SUMMARY_COLUMNS.items():
+            if name not in existing:
+                batch.add_column(sa.Column(name, type_(), nullable=True))
+
+    if not _has_table("transaction_lines"):
+        op.create_table(
+            "transaction_lines",
+            sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True),
+            sa.Column("transaction_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("transactions.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("line_no", sa.Integer(), nullable=False),
+            sa.Column("date", sa.Date(), nullable=True),
+            sa.Column("description", sa.String(), nullable=True),
+            sa.Column("amount", sa.Float(), nullable=True),
+            sa.Column("type", sa.String(), nullable=True),
+            sa.Column("category", sa.String(), nullable=True),
+            sa.Column("extra", JSONType, nullable=True),
+        )
+        op.create_index("ix_transaction_lines_transaction_id", "transaction_lines", ["transaction_id"])
+        op.create_index("ix_transaction_lines_user_id_date", "transaction_lines", ["user_id", "date"])
+
+    if not _has_table("upload_jobs"):
+        op.create_table(
+            "upload_jobs",
+            sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+            sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("file_name", sa.String(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("progress", sa.Integer(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("payload", sa.LargeBinary(), nullable=True),
+            sa.Column("result", JSONType, nullable=True),
+            sa.Column("error", sa.String(), nullable=True),
+            sa.Column("transaction_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("transactions.id"), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("upload_jobs")
+    op.drop_index("ix_transaction_lines_user_id_date", table_name="transaction_lines")
+    op.drop_index("ix_transaction_lines_transaction_id", table_name="transaction_lines")
+    op.drop_table("transaction_lines")
+    with op.batch_alter_table("transactions") as batch:
+        for name in reversed(list(SUMMARY_COLUMNS)):
+            batch.drop_column(name)
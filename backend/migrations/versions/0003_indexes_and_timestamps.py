@@ -0,0 +1,79 @@
+"""Per-user indexes, created_at timestamps, one behaviour row per user
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TIMESTAMPS = {
+    "loan_applications": ["created_at"],
+    "transactions": ["created_at"],
+    "financial_behavior": ["created_at", "updated_at"],
+}
+
+INDEXES = [
+    ("ix_loan_applications_user_id_created_at_id", "loan_applications", ["user_id", "created_at", "id"], False),
+    ("ix_transactions_user_id_created_at_id", "transactions", ["user_id", "created_at", "id"], False),
+    ("ix_upload_jobs_status_created_at", "upload_jobs", ["status", "created_at"], False),
+    ("uq_financial_behavior_user_id", "financial_behavior", ["user_id"], True),
+]
+
+
+def _written_at(table: str) -> str:
+    return f"COALESCE({table}.updated_at, {table}.created_at, '1970-01-01')"
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # SQLite cannot ADD COLUMN with a now() default, rebuild the table there
+    recreate = "always" if bind.dialect.name == "sqlite" else "auto"
+
+    for table, names in TIMESTAMPS.items():
+        existing = {column["name"] for column in _inspector().get_columns(table)}
+        missing = [name for name in names if name not in existing]
+        if missing:
+            with op.batch_alter_table(table, recreate=recreate) as batch:
+                for name in missing:
+                    # Existing rows get the migration time
+                    batch.add_column(sa.Column(name, sa.DateTime(timezone=True), server_default=sa.func.now()))
+
+    # Older code could insert a second behaviour row for a user, keep the most
+    # recently written one. Ids are random UUIDs and only break ties, e.g. rows
+    # whose timestamps were all just set to the migration time above
+    op.execute(
+        "DELETE FROM financial_behavior WHERE EXISTS ("
+        " SELECT 1 FROM financial_behavior AS later"
+        " WHERE later.user_id = financial_behavior.user_id AND ("
+        f"  {_written_at('later')} > {_written_at('financial_behavior')}"
+        f"  OR ({_written_at('later')} = {_written_at('financial_behavior')} AND later.id > financial_behavior.id)))"
+    )
+
+    for name, table, columns, unique in INDEXES:
+        existing = {index["name"] for index in _inspector().get_indexes(table)}
+        if name not in existing:
+            op.create_index(name, table, columns, unique=unique)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table, names in TIMESTAMPS.items():
+        with op.batch_alter_table(table) as batch:
+            for name in names:
+                batch.drop_column(name)
@@ -0,0 +1,48 @@
+"""Per-user monthly aggregates and statement line fingerprints
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSONType = sa.JSON().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def upgrade() -> None:
+    # Existing users are seeded from their transaction_lines on their next upload
+    op.create_table(
+        "user_monthly_aggregates",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("income", sa.Float(), nullable=False),
+        sa.Column("expense", sa.Float(), nullable=False),
+        sa.Column("category_expense", JSONType, nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("first_date", sa.Date(), nullable=True),
+        sa.Column("last_date", sa.Date(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "transaction_fingerprints",
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+        sa.Column("fingerprint", sa.String(32), primary_key=True),
+        sa.Column("transaction_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("transactions.id", ondelete="SET NULL"), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transaction_fingerprints")
+    op.drop_table("user_monthly_aggregates")
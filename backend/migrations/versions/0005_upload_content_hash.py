@@ -0,0 +1,37 @@
+"""Content hash of uploaded statements
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing uploads keep a NULL hash, they are not matched against re-uploads
+    with op.batch_alter_table("transactions") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(64), nullable=True))
+        batch.create_index("uq_transactions_user_id_content_hash", ["user_id", "content_hash"], unique=True)
+    with op.batch_alter_table("upload_jobs") as batch:
+        batch.add_column(sa.Column("content_hash", sa.String(64), nullable=True))
+        batch.create_index("ix_upload_jobs_user_id_content_hash", ["user_id", "content_hash"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("upload_jobs") as batch:
+        batch.drop_index("ix_upload_jobs_user_id_content_hash")
+        batch.drop_column("content_hash")
+    with op.batch_alter_table("transactions") as batch:
+        batch.drop_index("uq_transactions_user_id_content_hash")
+        batch.drop_column("content_hash")
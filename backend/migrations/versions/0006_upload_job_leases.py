@@ -0,0 +1,32 @@
+"""Leases on claimed upload jobs
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Jobs left "processing" have no lease and are taken over right away
+    with op.batch_alter_table("upload_jobs") as batch:
+        batch.add_column(sa.Column("lease_owner", postgresql.UUID(as_uuid=True), nullable=True))
+        batch.add_column(sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("upload_jobs") as batch:
+        batch.drop_column("lease_expires_at")
+        batch.drop_column("lease_owner")